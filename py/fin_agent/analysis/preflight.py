@@ -1,24 +1,182 @@
+"""Runtime budget preflight gates.
+
+Cost is dominated by the DuckDB row count, not Python arithmetic: optimize query
+shape, pushdown and connection reuse here (see ADR 0005).
+"""
+
 from __future__ import annotations
 
-import duckdb
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, fields
 
+from fin_agent.storage import duckdb_store
 from fin_agent.storage.paths import RuntimePaths
 
 
-def _count_market_rows(paths: RuntimePaths, universe: list[str], start_date: str, end_date: str) -> int:
-    if not universe:
-        raise ValueError("preflight failed: universe must not be empty")
-    placeholders = ",".join(["?"] * len(universe))
-    sql = f"""
-        SELECT COUNT(*) AS row_count
+@dataclass(frozen=True)
+class PreflightCoefficients:
+    world_state_per_row: float = 0.0001
+    world_state_per_symbol: float = 0.01
+    custom_code_per_row: float = 0.00035
+
+
+DEFAULT_COEFFICIENTS = PreflightCoefficients()
+
+_COEFFICIENTS_LOCK = threading.Lock()
+_COEFFICIENTS_CACHE: dict[str, tuple[tuple[int, int], PreflightCoefficients]] = {}
+
+# Cached counts are dropped on local ingestion via clear_preflight_cache(); the TTL
+# bounds staleness when another process writes to the same DuckDB file.
+_COUNT_CACHE_LIMIT = 512
+_COUNT_CACHE_TTL_SECONDS = 30.0
+_COUNT_CACHE_LOCK = threading.Lock()
+_COUNT_CACHE: OrderedDict[tuple[str, tuple[str, ...], str, str, bool], tuple[float, int]] = OrderedDict()
+
+_PRECISE_COUNT_SQL = """
+    SELECT COUNT(*) AS row_count
+    FROM market_ohlcv
+    WHERE list_contains(CAST(? AS VARCHAR[]), symbol)
+      AND timestamp >= CAST(CAST(? AS DATE) AS TIMESTAMP)
+      AND timestamp < CAST(CAST(? AS DATE) AS TIMESTAMP) + INTERVAL 1 DAY
+"""
+
+# The estimate below counts any span overlap as at least one row, so a range that falls
+# in a gap (holidays, missing days) is checked for real rows before it is trusted.
+_ROWS_EXIST_SQL = """
+    SELECT EXISTS (
+        SELECT 1
         FROM market_ohlcv
-        WHERE symbol IN ({placeholders})
-          AND CAST(timestamp AS DATE) BETWEEN CAST(? AS DATE) AND CAST(? AS DATE)
+        WHERE list_contains(CAST(? AS VARCHAR[]), symbol)
+          AND timestamp >= CAST(CAST(? AS DATE) AS TIMESTAMP)
+          AND timestamp < CAST(CAST(? AS DATE) AS TIMESTAMP) + INTERVAL 1 DAY
+    )
+"""
+
+# Linear interpolation of each symbol's row count over the overlap between its
+# [min_ts, max_ts] span and the requested day range; any overlap counts at least one row.
+_ESTIMATED_COUNT_SQL = """
+    WITH requested AS (
+        SELECT
+            CAST(CAST(? AS DATE) AS TIMESTAMP) AS start_ts,
+            CAST(CAST(? AS DATE) AS TIMESTAMP) + INTERVAL 1 DAY AS end_ts
+    ),
+    bounds AS (
+        SELECT
+            s.row_count,
+            s.min_ts,
+            s.max_ts,
+            r.start_ts,
+            r.end_ts,
+            GREATEST(s.min_ts, r.start_ts) AS lo,
+            LEAST(s.max_ts, r.end_ts) AS hi
+        FROM market_ohlcv_summary s, requested r
+        WHERE list_contains(CAST(? AS VARCHAR[]), s.symbol)
+    )
+    SELECT COALESCE(SUM(
+        CASE
+            WHEN max_ts < start_ts OR min_ts >= end_ts THEN 0
+            WHEN max_ts = min_ts THEN row_count
+            ELSE GREATEST(1, CEIL(row_count * (epoch(hi) - epoch(lo)) / (epoch(max_ts) - epoch(min_ts))))
+        END
+    ), 0) AS row_count
+    FROM bounds
+"""
+
+
+def _parse_coefficients(path: str, raw: object) -> PreflightCoefficients:
+    if not isinstance(raw, dict):
+        raise ValueError(f"preflight coefficients must be a JSON object: {path}")
+    allowed = {field.name for field in fields(PreflightCoefficients)}
+    unknown = sorted(set(raw) - allowed)
+    if unknown:
+        raise ValueError(f"unknown preflight coefficients in {path}: {unknown}")
+    values: dict[str, float] = {}
+    for key, value in raw.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+            raise ValueError(f"preflight coefficient {key} must be a positive number in {path}")
+        values[key] = float(value)
+    return PreflightCoefficients(**values)
+
+
+def load_preflight_coefficients(paths: RuntimePaths) -> PreflightCoefficients:
+    """Return estimator coefficients, overridden per runtime home by ``preflight.json``.
+
+    The file is optional; keys it omits keep their defaults. Parsed values are
+    cached until the file's mtime or size changes.
     """
-    with duckdb.connect(str(paths.duckdb_path)) as conn:
-        row_count = int(conn.execute(sql, [*universe, start_date, end_date]).fetchone()[0])
+    config_path = paths.root / "preflight.json"
+    try:
+        stat = config_path.stat()
+    except FileNotFoundError:
+        return DEFAULT_COEFFICIENTS
+    key = str(config_path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _COEFFICIENTS_LOCK:
+        cached = _COEFFICIENTS_CACHE.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+    try:
+        raw = json.loads(config_path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"invalid preflight coefficients JSON: {config_path}") from exc
+    coefficients = _parse_coefficients(key, raw)
+    with _COEFFICIENTS_LOCK:
+        _COEFFICIENTS_CACHE[key] = (signature, coefficients)
+    return coefficients
+
+
+def clear_preflight_cache() -> None:
+    with _COUNT_CACHE_LOCK:
+        _COUNT_CACHE.clear()
+
+
+def _query_market_rows(
+    paths: RuntimePaths,
+    universe: list[str],
+    start_date: str,
+    end_date: str,
+    precise: bool,
+) -> int:
+    # The universe binds as a single list parameter, so the statement text never varies with its size.
+    with duckdb_store.shared_cursor(paths) as conn:
+        if precise:
+            row = conn.execute(_PRECISE_COUNT_SQL, [universe, start_date, end_date]).fetchone()
+        else:
+            row = conn.execute(_ESTIMATED_COUNT_SQL, [start_date, end_date, universe]).fetchone()
+            if int(row[0]) > 0 and not conn.execute(_ROWS_EXIST_SQL, [universe, start_date, end_date]).fetchone()[0]:
+                return 0
+    return int(row[0])
+
+
+def _count_market_rows(
+    paths: RuntimePaths,
+    universe: list[str],
+    start_date: str,
+    end_date: str,
+    *,
+    precise: bool = False,
+) -> int:
+    if not universe:
+        raise ValueError("preflight failed: universe must not be empty")
+    key = (str(paths.duckdb_path), tuple(sorted(set(universe))), start_date, end_date, precise)
+    now = time.monotonic()
+    with _COUNT_CACHE_LOCK:
+        cached = _COUNT_CACHE.get(key)
+        if cached is not None and now - cached[0] <= _COUNT_CACHE_TTL_SECONDS:
+            _COUNT_CACHE.move_to_end(key)
+            return cached[1]
+
+    row_count = _query_market_rows(paths, list(key[1]), start_date, end_date, precise)
     if row_count <= 0:
         raise ValueError("preflight failed: no rows available for requested range")
+    with _COUNT_CACHE_LOCK:
+        _COUNT_CACHE[key] = (now, row_count)
+        _COUNT_CACHE.move_to_end(key)
+        while len(_COUNT_CACHE) > _COUNT_CACHE_LIMIT:
+            _COUNT_CACHE.popitem(last=False)
     return row_count
 
 
@@ -26,7 +184,8 @@ def estimate_world_state_runtime_seconds(
     paths: RuntimePaths, universe: list[str], start_date: str, end_date: str
 ) -> float:
     row_count = _count_market_rows(paths, universe, start_date, end_date)
-    return (row_count * 0.0001) + (len(universe) * 0.01)
+    coefficients = load_preflight_coefficients(paths)
+    return (row_count * coefficients.world_state_per_row) + (len(universe) * coefficients.world_state_per_symbol)
 
 
 def estimate_tuning_runtime_seconds(num_trials: int, per_trial_estimated_seconds: float) -> float:
@@ -47,7 +206,7 @@ def estimate_custom_code_runtime_seconds(
     if complexity_multiplier <= 0:
         raise ValueError("preflight failed: complexity_multiplier must be positive")
     row_count = _count_market_rows(paths, universe, start_date, end_date)
-    return row_count * 0.00035 * complexity_multiplier
+    return row_count * load_preflight_coefficients(paths).custom_code_per_row * complexity_multiplier
 
 
 def enforce_world_state_budget(
@@ -115,4 +274,3 @@ def enforce_custom_code_budget(
         "estimated_seconds": estimate_seconds,
         "max_allowed_seconds": max_estimated_seconds,
     }
-
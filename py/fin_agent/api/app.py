@@ -1,24 +1,30 @@
 from __future__ import annotations
 
 import asyncio
+import atexit
 import csv
 import hashlib
 import json
+import logging
 import os
+import re
 import threading
 import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Callable, Optional
+from typing import Annotated, Any, Callable, Optional
 
 import duckdb
 from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
 
 from fin_agent.backtest.compare import compare_backtest_runs
 from fin_agent.analysis.preflight import (
+    clear_preflight_cache,
     enforce_custom_code_budget,
     enforce_tuning_budget,
     enforce_world_state_budget,
@@ -56,19 +62,44 @@ from fin_agent.world_state.service import (
     validate_world_state_pit,
 )
 
+
+_LOGGER = logging.getLogger(__name__)
+
+
 def _runtime_paths() -> RuntimePaths:
-    root = Path(os.environ.get("FIN_AGENT_HOME", ".finagent"))
-    return RuntimePaths(root=root)
+    return _runtime_paths_for(os.environ.get("FIN_AGENT_HOME", ".finagent"))
+
+
+@lru_cache(maxsize=8)
+def _runtime_paths_for(home: str) -> RuntimePaths:
+    # Keyed by the env value so a changed FIN_AGENT_HOME still takes effect.
+    return RuntimePaths(root=Path(home))
 
 
 def _current_trace_id() -> str:
     return get_trace_id()
 
 
+# json.dumps builds a fresh encoder whenever options are passed; this one is reused and
+# produces identical text, so log rows and dataset hashes are unchanged.
+_SORTED_JSON_ENCODER = json.JSONEncoder(sort_keys=True, default=str)
+
+_STRUCTURED_LOG_MAX_ROW_BYTES = 8192
+# Summary fields kept when an oversized row is replaced; the stats reader needs the timing ones.
+_STRUCTURED_LOG_KEPT_FIELDS = ("method", "path", "status_code", "duration_ms")
+_STRUCTURED_LOG_FLUSH_SECONDS = 0.02
+_STRUCTURED_LOG_FLUSH_ROWS = 256
+_STRUCTURED_LOG_MAX_BUFFERED_ROWS = 100_000
+_STRUCTURED_LOG_LOCK = threading.Lock()
+_STRUCTURED_LOG_WRITE_LOCK = threading.Lock()
+_STRUCTURED_LOG_BUFFER: dict[Path, list[str]] = {}
+_STRUCTURED_LOG_WAKE = threading.Event()
+_STRUCTURED_LOG_FLUSHER: threading.Thread | None = None
+
+
 def _write_structured_log(event_type: str, payload: dict[str, Any]) -> None:
-    paths = _runtime_paths()
-    paths.ensure()
-    log_path = paths.logs_dir / "structured.log"
+    """Queue one JSONL row; a background thread appends queued rows in batches."""
+    log_path = _runtime_paths().logs_dir / "structured.log"
     row = redact_payload(
         {
         "event_type": event_type,
@@ -76,22 +107,104 @@ def _write_structured_log(event_type: str, payload: dict[str, Any]) -> None:
         **payload,
         }
     )
-    with log_path.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(row, sort_keys=True, default=str) + "\n")
+    line = _SORTED_JSON_ENCODER.encode(row)
+    if len(line) > _STRUCTURED_LOG_MAX_ROW_BYTES:
+        line = _SORTED_JSON_ENCODER.encode(_truncated_log_row(row, line))
+    line += "\n"
+    with _STRUCTURED_LOG_LOCK:
+        lines = _STRUCTURED_LOG_BUFFER.setdefault(log_path, [])
+        lines.append(line)
+        if len(lines) >= _STRUCTURED_LOG_FLUSH_ROWS:
+            _STRUCTURED_LOG_WAKE.set()
+    _start_structured_log_flusher()
+
+
+def _truncated_log_row(row: dict[str, Any], encoded: str) -> dict[str, Any]:
+    summary = {
+        "event_type": row.get("event_type"),
+        "trace_id": row.get("trace_id"),
+        "truncated": True,
+        "payload_size": len(encoded),
+        "payload_sha256_16": hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16],
+    }
+    for key in _STRUCTURED_LOG_KEPT_FIELDS:
+        value = row.get(key)
+        if isinstance(value, (int, float)) or (isinstance(value, str) and len(value) <= 512):
+            summary[key] = value
+    return summary
+
+
+def _flush_structured_log() -> None:
+    with _STRUCTURED_LOG_WRITE_LOCK:
+        with _STRUCTURED_LOG_LOCK:
+            pending = list(_STRUCTURED_LOG_BUFFER.items())
+            _STRUCTURED_LOG_BUFFER.clear()
+        for index, (log_path, lines) in enumerate(pending):
+            try:
+                log_path.parent.mkdir(parents=True, exist_ok=True)
+                with log_path.open("a", encoding="utf-8") as handle:
+                    handle.write("".join(lines))
+            except BaseException:
+                _requeue_structured_log(pending[index:])
+                raise
+
+
+def _requeue_structured_log(pending: list[tuple[Path, list[str]]]) -> None:
+    # Unwritten rows go back ahead of newer ones; a log that keeps failing is capped
+    # so the buffer cannot grow without bound.
+    with _STRUCTURED_LOG_LOCK:
+        for log_path, lines in pending:
+            merged = lines + _STRUCTURED_LOG_BUFFER.get(log_path, [])
+            _STRUCTURED_LOG_BUFFER[log_path] = merged[-_STRUCTURED_LOG_MAX_BUFFERED_ROWS:]
+
+
+def _structured_log_flusher() -> None:
+    while True:
+        _STRUCTURED_LOG_WAKE.wait(_STRUCTURED_LOG_FLUSH_SECONDS)
+        _STRUCTURED_LOG_WAKE.clear()
+        try:
+            _flush_structured_log()
+        except Exception:  # noqa: BLE001
+            # Keep the flusher alive; the rows were requeued and are retried next tick.
+            _LOGGER.exception("structured log flush failed")
+
+
+def _start_structured_log_flusher() -> None:
+    global _STRUCTURED_LOG_FLUSHER
+    if _STRUCTURED_LOG_FLUSHER is not None:
+        return
+    with _STRUCTURED_LOG_LOCK:
+        if _STRUCTURED_LOG_FLUSHER is None:
+            _STRUCTURED_LOG_FLUSHER = threading.Thread(
+                target=_structured_log_flusher,
+                name="fin-agent-structured-log",
+                daemon=True,
+            )
+            _STRUCTURED_LOG_FLUSHER.start()
+
+
+atexit.register(_flush_structured_log)
+
+
+def _audit_payload(payload: dict[str, Any]) -> dict[str, Any]:
+    return {
+        **redact_payload(payload),
+        "trace_id": _current_trace_id(),
+    }
 
 
 def _append_audit_event(paths: RuntimePaths, event_type: str, payload: dict[str, Any]) -> None:
-    sqlite_store.append_audit_event(
-        paths,
-        event_type,
-        {
-            **redact_payload(payload),
-            "trace_id": _current_trace_id(),
-        },
-    )
+    sqlite_store.append_audit_event(paths, event_type, _audit_payload(payload))
+
+
+_LOG_STATS_LIMIT = 8
+_LOG_STATS_LOCK = threading.Lock()
+_LOG_STATS_CACHE: OrderedDict[Path, dict[str, Any]] = OrderedDict()
 
 
 def _read_structured_log_stats(paths: RuntimePaths) -> dict[str, Any]:
+    """Summarize request rows in structured.log, parsing only lines appended since the last call."""
+    _flush_structured_log()
     log_path = paths.logs_dir / "structured.log"
     if not log_path.exists():
         return {
@@ -99,24 +212,49 @@ def _read_structured_log_stats(paths: RuntimePaths) -> dict[str, Any]:
             "error_count": 0,
             "avg_request_duration_ms": 0.0,
         }
-    request_count = 0
-    error_count = 0
-    durations: list[float] = []
-    with log_path.open("r", encoding="utf-8") as handle:
-        for line in handle:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                row = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-            if row.get("event_type") == "request.end":
-                request_count += 1
-                durations.append(float(row.get("duration_ms", 0.0)))
-            if str(row.get("event_type", "")).endswith("error"):
-                error_count += 1
-    avg = sum(durations) / len(durations) if durations else 0.0
+    with _LOG_STATS_LOCK:
+        stat = log_path.stat()
+        state = _LOG_STATS_CACHE.get(log_path)
+        if state is None or state["inode"] != stat.st_ino or stat.st_size < state["offset"]:
+            # First read, or the file was replaced or truncated: count from the start.
+            state = {"inode": stat.st_ino, "offset": 0, "request_count": 0, "error_count": 0, "duration_sum": 0.0}
+        _LOG_STATS_CACHE[log_path] = state
+        _LOG_STATS_CACHE.move_to_end(log_path)
+        while len(_LOG_STATS_CACHE) > _LOG_STATS_LIMIT:
+            _LOG_STATS_CACHE.popitem(last=False)
+
+        offset = state["offset"]
+        request_count = state["request_count"]
+        error_count = state["error_count"]
+        duration_sum = state["duration_sum"]
+        # Stream line by line so a first read of a large log stays in bounded memory.
+        with log_path.open("rb") as handle:
+            handle.seek(offset)
+            for line in handle:
+                if not line.endswith(b"\n"):
+                    # Leave a trailing partial line for the next call.
+                    break
+                offset += len(line)
+                # Only request.end and *error rows count; skip the rest before JSON decoding.
+                if b"request.end" not in line and b"error" not in line:
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if row.get("event_type") == "request.end":
+                    request_count += 1
+                    duration_sum += float(row.get("duration_ms", 0.0))
+                if str(row.get("event_type", "")).endswith("error"):
+                    error_count += 1
+        state.update(
+            offset=offset,
+            request_count=request_count,
+            error_count=error_count,
+            duration_sum=duration_sum,
+        )
+
+    avg = duration_sum / request_count if request_count else 0.0
     return {
         "request_count": request_count,
         "error_count": error_count,
@@ -146,6 +284,11 @@ def _max_world_state_seconds() -> float:
     return parsed
 
 
+# Shared constrained types for request models; the constraint schema is declared once.
+NonEmptyStr = Annotated[str, Field(min_length=1)]
+NonEmptyStrList = Annotated[list[str], Field(min_length=1)]
+
+
 class ImportRequest(BaseModel):
     path: str
 
@@ -198,7 +341,7 @@ class CodeStrategyValidateRequest(BaseModel):
 
 
 class CodeStrategySaveRequest(BaseModel):
-    strategy_name: str = Field(min_length=1)
+    strategy_name: NonEmptyStr
     source_code: str
 
 
@@ -210,9 +353,9 @@ class CodeStrategyRunRequest(BaseModel):
 
 
 class CodeStrategyBacktestRequest(BaseModel):
-    strategy_name: str = Field(min_length=1)
+    strategy_name: NonEmptyStr
     source_code: str
-    universe: list[str] = Field(min_length=1)
+    universe: NonEmptyStrList
     start_date: str
     end_date: str
     initial_capital: float = Field(gt=0)
@@ -222,9 +365,9 @@ class CodeStrategyBacktestRequest(BaseModel):
 
 
 class TuningRunRequest(BaseModel):
-    strategy_name: str = Field(min_length=1)
+    strategy_name: NonEmptyStr
     source_code: str
-    universe: list[str] = Field(min_length=1)
+    universe: NonEmptyStrList
     start_date: str
     end_date: str
     initial_capital: float = Field(gt=0)
@@ -237,6 +380,7 @@ class TuningRunRequest(BaseModel):
     timeout_seconds: int = Field(gt=0, default=5)
     memory_mb: int = Field(gt=0, default=256)
     cpu_seconds: int = Field(gt=0, default=2)
+    n_jobs: int = Field(gt=0, le=16, default=1)
     max_estimated_seconds: float | None = Field(default=None, gt=0)
     random_seed: int | None = None
     use_optuna: bool = False
@@ -274,29 +418,29 @@ class KiteInstrumentsSyncRequest(BaseModel):
 
 
 class KiteCandlesFetchRequest(BaseModel):
-    symbol: str = Field(min_length=1)
-    instrument_token: str = Field(min_length=1)
-    interval: str = Field(min_length=1)
-    from_ts: str = Field(min_length=1)
-    to_ts: str = Field(min_length=1)
+    symbol: NonEmptyStr
+    instrument_token: NonEmptyStr
+    interval: NonEmptyStr
+    from_ts: NonEmptyStr
+    to_ts: NonEmptyStr
     persist: bool = True
     use_cache: bool = True
     force_refresh: bool = False
 
 
 class KiteQuotesFetchRequest(BaseModel):
-    instruments: list[str] = Field(min_length=1)
+    instruments: NonEmptyStrList
     persist: bool = True
 
 
 class ScreenerFormulaValidateRequest(BaseModel):
-    formula: str = Field(min_length=1)
+    formula: NonEmptyStr
 
 
 class ScreenerRunRequest(BaseModel):
-    formula: str = Field(min_length=1)
+    formula: NonEmptyStr
     as_of: str
-    universe: list[str] = Field(min_length=1)
+    universe: NonEmptyStrList
     top_k: int = Field(default=50, gt=0)
     rank_by: str | None = None
     sort_order: str = "desc"
@@ -309,7 +453,7 @@ class TradingViewScanRequest(BaseModel):
 
 
 class NseQuoteRequest(BaseModel):
-    symbol: str = Field(min_length=1)
+    symbol: NonEmptyStr
 
 
 class BacktestTaxReportRequest(BaseModel):
@@ -324,17 +468,17 @@ class BacktestTaxReportRequest(BaseModel):
 
 
 class SessionSnapshotRequest(BaseModel):
-    session_id: str = Field(min_length=1)
+    session_id: NonEmptyStr
     state: dict[str, Any]
 
 
 class SessionRehydrateRequest(BaseModel):
-    session_id: str = Field(min_length=1)
+    session_id: NonEmptyStr
 
 
 class ContextDeltaRequest(BaseModel):
-    session_id: str = Field(min_length=1)
-    tool_name: str = Field(min_length=1)
+    session_id: NonEmptyStr
+    tool_name: NonEmptyStr
     tool_input: dict[str, Any]
     tool_output: dict[str, Any]
 
@@ -355,6 +499,7 @@ def _build_tuning_request_payload(request: TuningRunRequest) -> dict[str, Any]:
         "timeout_seconds": request.timeout_seconds,
         "memory_mb": request.memory_mb,
         "cpu_seconds": request.cpu_seconds,
+        "n_jobs": request.n_jobs,
         "max_estimated_seconds": request.max_estimated_seconds,
         "random_seed": request.random_seed,
         "use_optuna": request.use_optuna,
@@ -511,6 +656,7 @@ def _run_tuning_engine(
         run_code_fn=None,
         event_callback=callback,
         only_plan=request.only_plan,
+        n_jobs=request.n_jobs,
     )
     return _normalize_tuning_run_payload(request, result, run_id=tuning_run_id, status=result["status"])
 
@@ -527,7 +673,19 @@ def _run_tuning_job(
         result_payload = _run_tuning_engine(paths, request, tuning_run_id=tuning_run_id, callback=callback)
         if preflight is not None:
             result_payload["preflight"] = preflight
-        sqlite_store.update_tuning_run(paths, tuning_run_id, result_payload)
+        sqlite_store.update_tuning_run_with_audit(
+            paths,
+            tuning_run_id,
+            result_payload,
+            "tuning.run.completed",
+            _audit_payload(
+                {
+                    "tuning_run_id": tuning_run_id,
+                    "trials_attempted": result_payload.get("result", {}).get("trials_attempted", 0),
+                    "best_score": result_payload.get("result", {}).get("best_candidate", {}).get("score"),
+                }
+            ),
+        )
         if job_id is not None:
             sqlite_store.update_job_status(
                 paths,
@@ -538,19 +696,22 @@ def _run_tuning_job(
                     "result": result_payload["result"],
                 },
             )
-        _append_audit_event(
-            paths,
-            "tuning.run.completed",
-            {
-                "tuning_run_id": tuning_run_id,
-                "trials_attempted": result_payload.get("result", {}).get("trials_attempted", 0),
-                "best_score": result_payload.get("result", {}).get("best_candidate", {}).get("score"),
-            },
-        )
     except Exception as exc:  # noqa: BLE001
         error_payload = _build_tuning_initial_payload(request=request, tuning_run_id=tuning_run_id, status="failed", preflight=preflight)
         error_payload["result"] = {"status": "failed", "error": str(exc), "error_type": type(exc).__name__}
-        sqlite_store.update_tuning_run(paths, tuning_run_id, error_payload)
+        sqlite_store.update_tuning_run_with_audit(
+            paths,
+            tuning_run_id,
+            error_payload,
+            "tuning.run.failed",
+            _audit_payload(
+                {
+                    "tuning_run_id": tuning_run_id,
+                    "error": str(exc),
+                    "error_type": type(exc).__name__,
+                }
+            ),
+        )
         if job_id is not None:
             sqlite_store.update_job_status(
                 paths,
@@ -559,20 +720,50 @@ def _run_tuning_job(
                 error_text=str(exc),
                 result={"tuning_run_id": tuning_run_id},
             )
-        _append_audit_event(
-            paths,
-            "tuning.run.failed",
-            {
-                "tuning_run_id": tuning_run_id,
-                "error": str(exc),
-                "error_type": type(exc).__name__,
-            },
-        )
 
 
 app = FastAPI(title="Fin-Agent Stage 1 API", version="0.1.0")
 
 
+# Polled list endpoints: the body digest is the ETag, so a repeat poll with a matching
+# If-None-Match gets a bodyless 304. Registered before the trace middleware so 304s are logged.
+_CONDITIONAL_GET_PATHS = frozenset({"/v1/live/feed", "/v1/backtests/runs", "/v1/code-strategies"})
+
+
+_ENTITY_TAG_PATTERN = re.compile(r'(?:W/)?"[^"]*"')
+
+
+def _if_none_match(header: str, etag: str) -> bool:
+    """Apply RFC 9110 If-None-Match: ``*`` or any entity tag equal under weak comparison."""
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.removeprefix("W/") == opaque for tag in _ENTITY_TAG_PATTERN.findall(header))
+
+
+@app.middleware("http")
+async def conditional_get_middleware(request, call_next):  # type: ignore[no-untyped-def]
+    response = await call_next(request)
+    if request.method != "GET" or request.url.path not in _CONDITIONAL_GET_PATHS or response.status_code != 200:
+        return response
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    # Copy raw header pairs so repeated headers such as set-cookie survive; the
+    # replacement keeps only its own content-length.
+    if _if_none_match(request.headers.get("if-none-match", ""), etag):
+        dropped = {b"etag", b"content-length", b"content-type"}
+        replacement = Response(status_code=304)
+    else:
+        dropped = {b"etag", b"content-length"}
+        replacement = Response(content=body, status_code=response.status_code)
+    replacement.raw_headers = [
+        *(pair for pair in replacement.raw_headers if pair[0] == b"content-length"),
+        *(pair for pair in response.raw_headers if pair[0].lower() not in dropped),
+        (b"etag", etag.encode("latin-1")),
+    ]
+    return replacement
+
+
 @app.middleware("http")
 async def trace_logging_middleware(request, call_next):  # type: ignore[no-untyped-def]
     trace_id = request.headers.get("x-trace-id") or uuid.uuid4().hex
@@ -686,9 +877,46 @@ def _map_kite_error(exc: ValueError) -> HTTPException:
     )
 
 
+def _map_market_store_error(exc: duckdb.Error) -> HTTPException:
+    text = str(exc)
+    if isinstance(exc, duckdb.TransactionException):
+        return HTTPException(
+            status_code=409,
+            detail={
+                "code": "market_write_conflict",
+                "message": "a concurrent write to the same market rows was committed first",
+                "remediation": "retry the request",
+                "source_error": text,
+            },
+        )
+    return HTTPException(
+        status_code=500,
+        detail={
+            "code": "market_store_error",
+            "message": "failed to write market data",
+            "source_error": text,
+        },
+    )
+
+
+_JSON_HASH_CHUNK_ROWS = 512
+
+
 def _json_hash(payload: Any) -> str:
-    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
-    return hashlib.sha256(encoded).hexdigest()
+    digest = hashlib.sha256()
+    if isinstance(payload, (list, tuple)) and len(payload) > _JSON_HASH_CHUNK_ROWS:
+        # Feed "[a, b, ...]" a slice at a time: the digest matches hashing the whole
+        # document, but a 20k-row payload is never materialized as one string.
+        digest.update(b"[")
+        for start in range(0, len(payload), _JSON_HASH_CHUNK_ROWS):
+            if start:
+                digest.update(b", ")
+            chunk = _SORTED_JSON_ENCODER.encode(list(payload[start : start + _JSON_HASH_CHUNK_ROWS]))
+            digest.update(chunk[1:-1].encode("utf-8"))
+        digest.update(b"]")
+    else:
+        digest.update(_SORTED_JSON_ENCODER.encode(payload).encode("utf-8"))
+    return digest.hexdigest()
 
 
 def _provider_rate_limit_or_raise(provider: str) -> dict[str, float | int]:
@@ -731,25 +959,64 @@ def _kite_candle_cache_key(request: KiteCandlesFetchRequest) -> str:
     )
 
 
+# In-process front for the kite_candle_cache table. Refreshes in this process drop their
+# entry; the TTL bounds staleness when another process rewrites the same SQLite cache.
+_CANDLE_CACHE_LIMIT = 1024
+_CANDLE_CACHE_TTL_SECONDS = 60.0
+_CANDLE_CACHE_LOCK = threading.Lock()
+_CANDLE_CACHE: OrderedDict[tuple[str, str], tuple[float, dict[str, Any]]] = OrderedDict()
+
+
+def _get_kite_candle_cache(paths: RuntimePaths, cache_key: str) -> dict[str, Any] | None:
+    key = (str(paths.sqlite_path), cache_key)
+    now = time.monotonic()
+    with _CANDLE_CACHE_LOCK:
+        cached = _CANDLE_CACHE.get(key)
+        if cached is not None and now - cached[0] <= _CANDLE_CACHE_TTL_SECONDS:
+            _CANDLE_CACHE.move_to_end(key)
+            return cached[1]
+
+    entry = sqlite_store.get_kite_candle_cache(paths, cache_key)
+    if entry is not None:
+        with _CANDLE_CACHE_LOCK:
+            _CANDLE_CACHE[key] = (now, entry)
+            _CANDLE_CACHE.move_to_end(key)
+            while len(_CANDLE_CACHE) > _CANDLE_CACHE_LIMIT:
+                _CANDLE_CACHE.popitem(last=False)
+    return entry
+
+
+def _forget_kite_candle_cache(paths: RuntimePaths, cache_key: str) -> None:
+    with _CANDLE_CACHE_LOCK:
+        _CANDLE_CACHE.pop((str(paths.sqlite_path), cache_key), None)
+
+
+_MISSING = object()
+
+
 def _flatten_state_diff(path: str, before: Any, after: Any, changes: list[dict[str, Any]]) -> None:
-    if isinstance(before, dict) and isinstance(after, dict):
-        keys = sorted(set(before.keys()) | set(after.keys()))
-        for key in keys:
-            current_path = f"{path}.{key}" if path else str(key)
-            if key not in before:
-                changes.append({"path": current_path, "change_type": "added", "before": None, "after": after[key]})
-                continue
-            if key not in after:
-                changes.append({"path": current_path, "change_type": "removed", "before": before[key], "after": None})
-                continue
-            _flatten_state_diff(current_path, before[key], after[key], changes)
-        return
-    if isinstance(before, list) and isinstance(after, list):
+    # Depth-first over an explicit stack; children are pushed in reverse sorted-key order so
+    # changes come out in the same order as a recursive walk.
+    stack: list[tuple[str, Any, Any]] = [(path, before, after)]
+    while stack:
+        path, before, after = stack.pop()
+        if before is _MISSING:
+            changes.append({"path": path, "change_type": "added", "before": None, "after": after})
+            continue
+        if after is _MISSING:
+            changes.append({"path": path, "change_type": "removed", "before": before, "after": None})
+            continue
+        if isinstance(before, dict) and isinstance(after, dict):
+            for key in sorted(before.keys() | after.keys(), reverse=True):
+                left = before.get(key, _MISSING)
+                right = after.get(key, _MISSING)
+                # Equal subtrees cannot contribute changes; one C-level comparison skips the walk.
+                if left is not _MISSING and right is not _MISSING and left == right:
+                    continue
+                stack.append((f"{path}.{key}" if path else str(key), left, right))
+            continue
         if before != after:
             changes.append({"path": path or "$", "change_type": "changed", "before": before, "after": after})
-        return
-    if before != after:
-        changes.append({"path": path or "$", "change_type": "changed", "before": before, "after": after})
 
 
 @app.get("/v1/auth/kite/connect")
@@ -944,6 +1211,36 @@ def kite_holdings() -> dict[str, Any]:
     return {"connector": "kite", "holdings": holdings, "count": len(holdings)}
 
 
+_KITE_INSTRUMENT_COLUMNS = {
+    "instrument_token": "VARCHAR",
+    "exchange": "VARCHAR",
+    "segment": "VARCHAR",
+    "tradingsymbol": "VARCHAR",
+    "name": "VARCHAR",
+    "lot_size": "DOUBLE",
+    "tick_size": "DOUBLE",
+    "expiry": "VARCHAR",
+    "strike": "DOUBLE",
+    "instrument_type": "VARCHAR",
+}
+
+_KITE_CANDLE_COLUMNS = {
+    "timestamp": "VARCHAR",
+    "open": "DOUBLE",
+    "high": "DOUBLE",
+    "low": "DOUBLE",
+    "close": "DOUBLE",
+    "volume": "DOUBLE",
+}
+
+_KITE_QUOTE_COLUMNS = {
+    "quote_key": "VARCHAR",
+    "instrument_token": "VARCHAR",
+    "last_price": "DOUBLE",
+    "payload_json": "VARCHAR",
+}
+
+
 @app.post("/v1/kite/instruments/sync")
 def kite_instruments_sync(request: KiteInstrumentsSyncRequest) -> dict[str, Any]:
     paths = _runtime_paths()
@@ -963,30 +1260,43 @@ def kite_instruments_sync(request: KiteInstrumentsSyncRequest) -> dict[str, Any]
     now = datetime.now(timezone.utc).isoformat()
     dataset_hash = _json_hash(bounded)
     duckdb_store.init_db(paths)
-    with duckdb.connect(str(paths.duckdb_path)) as conn:
-        conn.execute("DELETE FROM market_instruments WHERE source = 'kite'")
-        for row in bounded:
-            conn.execute(
-                """
-                INSERT INTO market_instruments
-                  (instrument_token, exchange, segment, tradingsymbol, name, lot_size, tick_size, expiry, strike, instrument_type, source, dataset_hash, fetched_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'kite', ?, CAST(? AS TIMESTAMP))
-                """,
-                [
-                    str(row.get("instrument_token", "")).strip(),
-                    str(row.get("exchange", "")).strip() or None,
-                    str(row.get("segment", "")).strip() or None,
-                    str(row.get("tradingsymbol", "")).strip(),
-                    str(row.get("name", "")).strip() or None,
-                    float(row.get("lot_size", 0.0)) if row.get("lot_size") is not None else None,
-                    float(row.get("tick_size", 0.0)) if row.get("tick_size") is not None else None,
-                    str(row.get("expiry", "")).strip() or None,
-                    float(row.get("strike", 0.0)) if row.get("strike") is not None else None,
-                    str(row.get("instrument_type", "")).strip() or None,
-                    dataset_hash,
-                    now,
-                ],
-            )
+    instrument_rows = [
+        [
+            str(row.get("instrument_token", "")).strip(),
+            str(row.get("exchange", "")).strip() or None,
+            str(row.get("segment", "")).strip() or None,
+            str(row.get("tradingsymbol", "")).strip(),
+            str(row.get("name", "")).strip() or None,
+            float(row.get("lot_size", 0.0)) if row.get("lot_size") is not None else None,
+            float(row.get("tick_size", 0.0)) if row.get("tick_size") is not None else None,
+            str(row.get("expiry", "")).strip() or None,
+            float(row.get("strike", 0.0)) if row.get("strike") is not None else None,
+            str(row.get("instrument_type", "")).strip() or None,
+        ]
+        for row in bounded
+    ]
+    with duckdb_store.staged_rows(_KITE_INSTRUMENT_COLUMNS, instrument_rows) as (staged, staged_path):
+        with duckdb_store.shared_cursor(paths, release=True) as conn:
+            # One transaction: readers never see the table emptied between delete and insert.
+            conn.begin()
+            try:
+                conn.execute("DELETE FROM market_instruments WHERE source = 'kite'")
+                if instrument_rows:
+                    conn.execute(
+                        f"""
+                        INSERT INTO market_instruments
+                          (instrument_token, exchange, segment, tradingsymbol, name, lot_size, tick_size, expiry, strike, instrument_type, source, dataset_hash, fetched_at)
+                        SELECT
+                          instrument_token, exchange, segment, tradingsymbol, name, lot_size, tick_size, expiry, strike, instrument_type,
+                          'kite', ?, CAST(? AS TIMESTAMP)
+                        FROM {staged}
+                        """,
+                        [dataset_hash, now, staged_path],
+                    )
+                conn.commit()
+            except duckdb.Error as exc:
+                conn.rollback()
+                raise _map_market_store_error(exc) from exc
     _append_audit_event(
         paths,
         "kite.instruments.sync",
@@ -1004,7 +1314,7 @@ def kite_candles_fetch(request: KiteCandlesFetchRequest) -> dict[str, Any]:
     paths = _runtime_paths()
     cache_key = _kite_candle_cache_key(request)
     if request.use_cache and not request.force_refresh:
-        cached = sqlite_store.get_kite_candle_cache(paths, cache_key)
+        cached = _get_kite_candle_cache(paths, cache_key)
         if cached is not None:
             _append_audit_event(
                 paths,
@@ -1049,32 +1359,41 @@ def kite_candles_fetch(request: KiteCandlesFetchRequest) -> dict[str, Any]:
     if request.persist:
         now = datetime.now(timezone.utc).isoformat()
         duckdb_store.init_db(paths)
-        with duckdb.connect(str(paths.duckdb_path)) as conn:
-            for row in rows:
-                conn.execute(
-                    """
-                    INSERT INTO market_ohlcv (timestamp, published_at, symbol, open, high, low, close, volume, source_file, dataset_hash, ingested_at)
-                    VALUES (
-                      CAST(? AS TIMESTAMP),
-                      CAST(? AS TIMESTAMP),
-                      ?, ?, ?, ?, ?, ?,
-                      'kite_api', ?, CAST(? AS TIMESTAMP)
-                    )
-                    """,
-                    [
-                        row["timestamp"],
-                        row["timestamp"],
-                        request.symbol,
-                        float(row["open"]),
-                        float(row["high"]),
-                        float(row["low"]),
-                        float(row["close"]),
-                        float(row["volume"]),
-                        dataset_hash,
-                        now,
-                    ],
-                )
-                inserted += 1
+        candle_rows = [
+            [
+                row["timestamp"],
+                float(row["open"]),
+                float(row["high"]),
+                float(row["low"]),
+                float(row["close"]),
+                float(row["volume"]),
+            ]
+            for row in rows
+        ]
+        with duckdb_store.staged_rows(_KITE_CANDLE_COLUMNS, candle_rows) as (staged, staged_path):
+            with duckdb_store.shared_cursor(paths, release=True) as conn:
+                conn.begin()
+                try:
+                    if candle_rows:
+                        conn.execute(
+                            f"""
+                            INSERT INTO market_ohlcv (timestamp, published_at, symbol, open, high, low, close, volume, source_file, dataset_hash, ingested_at)
+                            SELECT
+                              CAST(timestamp AS TIMESTAMP),
+                              CAST(timestamp AS TIMESTAMP),
+                              ?, open, high, low, close, volume,
+                              'kite_api', ?, CAST(? AS TIMESTAMP)
+                            FROM {staged}
+                            """,
+                            [request.symbol, dataset_hash, now, staged_path],
+                        )
+                    duckdb_store.refresh_ohlcv_summary(conn, [request.symbol])
+                    conn.commit()
+                except duckdb.Error as exc:
+                    conn.rollback()
+                    raise _map_market_store_error(exc) from exc
+                inserted = len(candle_rows)
+        clear_preflight_cache()
         sqlite_store.upsert_kite_candle_cache(
             paths,
             cache_key=cache_key,
@@ -1086,6 +1405,7 @@ def kite_candles_fetch(request: KiteCandlesFetchRequest) -> dict[str, Any]:
             row_count=len(rows),
             dataset_hash=dataset_hash,
         )
+        _forget_kite_candle_cache(paths, cache_key)
 
     _append_audit_event(
         paths,
@@ -1131,22 +1451,34 @@ def kite_quotes_fetch(request: KiteQuotesFetchRequest) -> dict[str, Any]:
     if request.persist:
         now = datetime.now(timezone.utc).isoformat()
         duckdb_store.init_db(paths)
-        with duckdb.connect(str(paths.duckdb_path)) as conn:
-            for key, row in payload.items():
-                conn.execute(
-                    """
-                    INSERT INTO market_quotes (quote_key, instrument_token, last_price, payload_json, source, fetched_at)
-                    VALUES (?, ?, ?, ?, 'kite', CAST(? AS TIMESTAMP))
-                    """,
-                    [
-                        key,
-                        str(row.get("instrument_token", "")).strip() or None,
-                        float(row.get("last_price", 0.0)) if row.get("last_price") is not None else None,
-                        json.dumps(row, sort_keys=True, default=str),
-                        now,
-                    ],
-                )
-                persisted += 1
+        # A generator: rows are encoded straight into the staging file, never held as a list.
+        quote_rows = (
+            [
+                key,
+                str(row.get("instrument_token", "")).strip() or None,
+                float(row.get("last_price", 0.0)) if row.get("last_price") is not None else None,
+                _SORTED_JSON_ENCODER.encode(row),
+            ]
+            for key, row in payload.items()
+        )
+        with duckdb_store.staged_rows(_KITE_QUOTE_COLUMNS, quote_rows) as (staged, staged_path):
+            with duckdb_store.shared_cursor(paths, release=True) as conn:
+                conn.begin()
+                try:
+                    if payload:
+                        conn.execute(
+                            f"""
+                            INSERT INTO market_quotes (quote_key, instrument_token, last_price, payload_json, source, fetched_at)
+                            SELECT quote_key, instrument_token, last_price, payload_json, 'kite', CAST(? AS TIMESTAMP)
+                            FROM {staged}
+                            """,
+                            [now, staged_path],
+                        )
+                    conn.commit()
+                except duckdb.Error as exc:
+                    conn.rollback()
+                    raise _map_market_store_error(exc) from exc
+        persisted = len(payload)
 
     _append_audit_event(
         paths,
@@ -1734,8 +2066,54 @@ def _read_csv_rows(path: str) -> list[dict[str, Any]]:
     if not csv_path.exists():
         raise ValueError(f"artifact not found: {path}")
     with csv_path.open("r", encoding="utf-8", newline="") as handle:
-        reader = csv.DictReader(handle)
-        return [dict(row) for row in reader]
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        if header is None:
+            return []
+        width = len(header)
+        rows: list[dict[str, Any]] = []
+        for row in reader:
+            if not row:
+                continue
+            if len(row) == width:
+                rows.append(dict(zip(header, row)))
+                continue
+            # Ragged rows keep csv.DictReader semantics: missing fields are None and
+            # extra fields are listed under the None key.
+            record: dict[Any, Any] = dict(zip(header, row))
+            for name in header[len(row):]:
+                record[name] = None
+            if len(row) > width:
+                record[None] = row[width:]
+            rows.append(record)
+        return rows
+
+
+def _count_signal_rows(paths: RuntimePaths, path: str) -> tuple[int, int]:
+    csv_path = Path(path)
+    if not csv_path.exists():
+        raise ValueError(f"artifact not found: {path}")
+    with csv_path.open("r", encoding="utf-8", newline="") as handle:
+        header = next(csv.reader(handle), None)
+    if header is None:
+        return 0, 0
+    crossings = (
+        "count(*) FILTER (WHERE starts_with(reason_code, 'signal_') OR starts_with(reason_code, 'sma_cross'))"
+        if "reason_code" in header
+        else "0"
+    )
+    with duckdb_store.shared_cursor(paths) as conn:
+        signal_rows, threshold_crossings = conn.execute(
+            f"""
+            SELECT count(*), {crossings}
+            FROM read_csv(
+                ?, header = true, all_varchar = true, null_padding = true, parallel = false,
+                delim = ',', quote = '"', escape = '"'
+            )
+            """,
+            [csv_path.as_posix()],
+        ).fetchone()
+    return int(signal_rows), int(threshold_crossings)
 
 
 @app.post("/v1/visualize/trade-blotter")
@@ -1749,16 +2127,10 @@ def visualize_trade_blotter(request: TradeBlotterRequest) -> dict[str, Any]:
         if not trade_path or not signal_path:
             raise ValueError("run artifacts missing trade_blotter_path/signal_context_path")
         trades = _read_csv_rows(trade_path)
-        signals = _read_csv_rows(signal_path)
-    except ValueError as exc:
+        signal_rows, threshold_crossings = _count_signal_rows(paths, signal_path)
+    except (ValueError, duckdb.Error) as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    threshold_crossings = [
-        row
-        for row in signals
-        if str(row.get("reason_code", "")).startswith("signal_")
-        or str(row.get("reason_code", "")).startswith("sma_cross")
-    ]
     return {
         "run_id": request.run_id,
         "artifacts": {
@@ -1766,8 +2138,8 @@ def visualize_trade_blotter(request: TradeBlotterRequest) -> dict[str, Any]:
             "signal_context_path": signal_path,
         },
         "trade_count": len(trades),
-        "signal_rows": len(signals),
-        "threshold_crossings": len(threshold_crossings),
+        "signal_rows": signal_rows,
+        "threshold_crossings": threshold_crossings,
         "trades": trades,
     }
 
@@ -1811,16 +2183,7 @@ def live_activate(request: LiveActivateRequest) -> dict[str, Any]:
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    for row in snapshot:
-        sqlite_store.append_live_insight(
-            paths,
-            strategy_version_id=strategy_version_id,
-            action=str(row["action"]),
-            symbol=str(row["symbol"]),
-            reason_code=str(row["reason_code"]),
-            score=float(row["score"]),
-            payload=row,
-        )
+    sqlite_store.append_live_insights(paths, strategy_version_id=strategy_version_id, rows=snapshot)
     sqlite_store.upsert_live_state(
         paths,
         strategy_version_id=strategy_version_id,
@@ -1852,13 +2215,12 @@ def live_activate(request: LiveActivateRequest) -> dict[str, Any]:
 def live_pause(request: LiveLifecycleRequest) -> dict[str, Any]:
     paths = _runtime_paths()
     try:
-        live_state = sqlite_store.get_live_state(paths, request.strategy_version_id)
-        sqlite_store.upsert_live_state(
+        sqlite_store.set_live_status(
             paths,
             strategy_version_id=request.strategy_version_id,
-            strategy_name=live_state["strategy_name"],
             status="paused",
-            payload={**live_state["payload"], "paused_at": datetime.now(timezone.utc).isoformat()},
+            timestamp_key="paused_at",
+            timestamp=datetime.now(timezone.utc).isoformat(),
         )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
@@ -1869,13 +2231,12 @@ def live_pause(request: LiveLifecycleRequest) -> dict[str, Any]:
 def live_stop(request: LiveLifecycleRequest) -> dict[str, Any]:
     paths = _runtime_paths()
     try:
-        live_state = sqlite_store.get_live_state(paths, request.strategy_version_id)
-        sqlite_store.upsert_live_state(
+        sqlite_store.set_live_status(
             paths,
             strategy_version_id=request.strategy_version_id,
-            strategy_name=live_state["strategy_name"],
             status="stopped",
-            payload={**live_state["payload"], "stopped_at": datetime.now(timezone.utc).isoformat()},
+            timestamp_key="stopped_at",
+            timestamp=datetime.now(timezone.utc).isoformat(),
         )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
@@ -1970,7 +2331,7 @@ def backtest_compare(request: BacktestCompareRequest) -> dict[str, Any]:
         )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
-    return report
+    return report.to_dict()
 
 
 @app.post("/v1/backtests/tax/report")
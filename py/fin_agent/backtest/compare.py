@@ -1,11 +1,37 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import Any
 
 from fin_agent.storage import sqlite_store
 from fin_agent.storage.paths import RuntimePaths
 
 
+@dataclass(frozen=True)
+class RunSnapshot:
+    run_id: str
+    created_at: str
+    metrics: dict[str, Any]
+
+
+@dataclass(frozen=True)
+class BacktestComparison:
+    baseline: RunSnapshot
+    candidate: RunSnapshot
+    metrics_delta: dict[str, float]
+    artifact_links: dict[str, dict[str, Any]]
+    likely_causes: list[str]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "baseline": dict(self.baseline.__dict__),
+            "candidate": dict(self.candidate.__dict__),
+            "metrics_delta": self.metrics_delta,
+            "artifact_links": self.artifact_links,
+            "likely_causes": self.likely_causes,
+        }
+
+
 METRIC_KEYS = [
     "final_equity",
     "total_return",
@@ -15,6 +41,27 @@ METRIC_KEYS = [
     "trade_count",
 ]
 
+STRATEGY_PARAM_KEYS = ("short_window", "long_window", "max_positions", "cost_bps", "signal_type")
+
+# (delta key, note when delta > 0, note when delta < 0); templates receive delta, magnitude and count.
+DELTA_NOTE_RULES = (
+    (
+        "total_return",
+        "candidate improved total_return by {magnitude:.6f}",
+        "candidate reduced total_return by {magnitude:.6f}",
+    ),
+    (
+        "max_drawdown",
+        "candidate drawdown improved (less negative max_drawdown)",
+        "candidate drawdown became deeper (more negative max_drawdown)",
+    ),
+    (
+        "trade_count",
+        "trade_count changed by {count}",
+        "trade_count changed by {count}",
+    ),
+)
+
 
 def _metric_deltas(baseline: dict[str, Any], candidate: dict[str, Any]) -> dict[str, float]:
     result: dict[str, float] = {}
@@ -25,29 +72,24 @@ def _metric_deltas(baseline: dict[str, Any], candidate: dict[str, Any]) -> dict[
     return result
 
 
-def _likely_causes(baseline_payload: dict[str, Any], candidate_payload: dict[str, Any], deltas: dict[str, float]) -> list[str]:
+def _likely_causes(base_strategy: dict[str, Any], cand_strategy: dict[str, Any], deltas: dict[str, float]) -> list[str]:
     notes: list[str] = []
-    base_strategy = baseline_payload.get("strategy", {})
-    cand_strategy = candidate_payload.get("strategy", {})
 
-    for key in ("short_window", "long_window", "max_positions", "cost_bps", "signal_type"):
-        if base_strategy.get(key) != cand_strategy.get(key):
-            notes.append(
-                f"strategy parameter changed: {key} baseline={base_strategy.get(key)} candidate={cand_strategy.get(key)}"
-            )
-
-    if deltas.get("total_return", 0.0) > 0:
-        notes.append(f"candidate improved total_return by {deltas['total_return']:.6f}")
-    elif deltas.get("total_return", 0.0) < 0:
-        notes.append(f"candidate reduced total_return by {abs(deltas['total_return']):.6f}")
-
-    if deltas.get("max_drawdown", 0.0) < 0:
-        notes.append("candidate drawdown became deeper (more negative max_drawdown)")
-    elif deltas.get("max_drawdown", 0.0) > 0:
-        notes.append("candidate drawdown improved (less negative max_drawdown)")
-
-    if deltas.get("trade_count", 0.0) != 0:
-        notes.append(f"trade_count changed by {int(deltas['trade_count'])}")
+    for key in STRATEGY_PARAM_KEYS:
+        base_value = base_strategy.get(key)
+        cand_value = cand_strategy.get(key)
+        if base_value != cand_value:
+            notes.append(f"strategy parameter changed: {key} baseline={base_value} candidate={cand_value}")
+
+    for key, positive_note, negative_note in DELTA_NOTE_RULES:
+        delta = deltas.get(key, 0.0)
+        if delta > 0:
+            template = positive_note
+        elif delta < 0:
+            template = negative_note
+        else:
+            continue
+        notes.append(template.format(delta=delta, magnitude=abs(delta), count=int(delta)))
 
     if not notes:
         notes.append("no clear cause identified from available metadata")
@@ -58,30 +100,29 @@ def compare_backtest_runs(
     runtime_paths: RuntimePaths,
     baseline_run_id: str,
     candidate_run_id: str,
-) -> dict[str, Any]:
-    baseline = sqlite_store.get_backtest_run(runtime_paths, baseline_run_id)
-    candidate = sqlite_store.get_backtest_run(runtime_paths, candidate_run_id)
+) -> BacktestComparison:
+    baseline, candidate = sqlite_store.get_backtest_run_summaries(runtime_paths, [baseline_run_id, candidate_run_id])
 
     baseline_metrics = baseline["metrics"]
     candidate_metrics = candidate["metrics"]
     deltas = _metric_deltas(baseline_metrics, candidate_metrics)
-    causes = _likely_causes(baseline["payload"], candidate["payload"], deltas)
-
-    return {
-        "baseline": {
-            "run_id": baseline["run_id"],
-            "created_at": baseline["created_at"],
-            "metrics": baseline_metrics,
-        },
-        "candidate": {
-            "run_id": candidate["run_id"],
-            "created_at": candidate["created_at"],
-            "metrics": candidate_metrics,
-        },
-        "metrics_delta": deltas,
-        "artifact_links": {
+    causes = _likely_causes(baseline["strategy"], candidate["strategy"], deltas)
+
+    return BacktestComparison(
+        baseline=RunSnapshot(
+            run_id=baseline["run_id"],
+            created_at=baseline["created_at"],
+            metrics=baseline_metrics,
+        ),
+        candidate=RunSnapshot(
+            run_id=candidate["run_id"],
+            created_at=candidate["created_at"],
+            metrics=candidate_metrics,
+        ),
+        metrics_delta=deltas,
+        artifact_links={
             "baseline": baseline["artifacts"],
             "candidate": candidate["artifacts"],
         },
-        "likely_causes": causes,
-    }
+        likely_causes=causes,
+    )
@@ -1,21 +1,22 @@
 from __future__ import annotations
 
 import math
+from itertools import accumulate
 
 from fin_agent.backtest.models import BacktestMetrics
 
 
-def compute_backtest_metrics(equity_by_day: list[float], trade_count: int) -> BacktestMetrics:
+def validate_equity_series(equity_by_day: list[float]) -> None:
     if len(equity_by_day) < 2:
         raise ValueError("need at least 2 points to compute metrics")
 
-    returns = []
-    for idx in range(1, len(equity_by_day)):
-        prev = equity_by_day[idx - 1]
-        curr = equity_by_day[idx]
-        if prev <= 0:
-            raise ValueError("equity became non-positive; metrics invalid")
-        returns.append((curr - prev) / prev)
+    if min(equity_by_day[:-1]) <= 0:
+        raise ValueError("equity became non-positive; metrics invalid")
+
+
+def compute_backtest_metrics(equity_by_day: list[float], trade_count: int) -> BacktestMetrics:
+    validate_equity_series(equity_by_day)
+    returns = [(curr - prev) / prev for prev, curr in zip(equity_by_day, equity_by_day[1:])]
 
     initial = equity_by_day[0]
     final = equity_by_day[-1]
@@ -28,12 +29,8 @@ def compute_backtest_metrics(equity_by_day: list[float], trade_count: int) -> Ba
     std_dev = math.sqrt(variance)
     sharpe = 0.0 if std_dev == 0 else (mean_ret / std_dev) * math.sqrt(252.0)
 
-    peak = equity_by_day[0]
-    max_drawdown = 0.0
-    for value in equity_by_day:
-        peak = max(peak, value)
-        drawdown = (value / peak) - 1.0
-        max_drawdown = min(max_drawdown, drawdown)
+    # Running peaks come from accumulate(max); the first point is its own peak, so this is <= 0.
+    max_drawdown = min(value / peak for value, peak in zip(equity_by_day, accumulate(equity_by_day, max))) - 1.0
 
     return BacktestMetrics(
         final_equity=final,
@@ -1,25 +1,33 @@
 from __future__ import annotations
 
 import csv
+import operator
+import uuid
 from collections import defaultdict
 from datetime import datetime, timezone
+from itertools import accumulate
 from pathlib import Path
 from typing import Any
 
-import duckdb
-
-from fin_agent.backtest.metrics import compute_backtest_metrics
-from fin_agent.backtest.models import BacktestArtifacts, BacktestRun
+from fin_agent.backtest.metrics import compute_backtest_metrics, validate_equity_series
+from fin_agent.backtest.models import BacktestArtifacts, BacktestMetrics, BacktestRun
 from fin_agent.code_strategy.runner import run_code_strategy_sandbox
 from fin_agent.code_strategy.validator import validate_code_strategy_source
-from fin_agent.storage import sqlite_store
+from fin_agent.storage import duckdb_store, sqlite_store
 from fin_agent.storage.paths import RuntimePaths
 from fin_agent.viz.svg import write_line_chart_svg
-from fin_agent.world_state.service import build_world_state_manifest
+from fin_agent.world_state.service import WorldStateManifest, build_world_state_manifest
 
 
-def _date_key(value: datetime) -> str:
-    return value.strftime("%Y-%m-%d")
+# The universe binds as one list parameter, so the statement text is the same for every run.
+_BARS_SQL = """
+    SELECT symbol, strftime(timestamp, '%Y-%m-%d') AS day, close
+    FROM market_ohlcv
+    WHERE list_contains(CAST(? AS VARCHAR[]), symbol)
+      AND timestamp >= CAST(CAST(? AS DATE) AS TIMESTAMP)
+      AND timestamp < CAST(CAST(? AS DATE) AS TIMESTAMP) + INTERVAL 1 DAY
+    ORDER BY symbol, timestamp
+"""
 
 
 def run_code_strategy_backtest(
@@ -34,11 +42,18 @@ def run_code_strategy_backtest(
     memory_mb: int = 256,
     cpu_seconds: int = 2,
     context: dict[str, Any] | None = None,
+    world_manifest: WorldStateManifest | None = None,
 ) -> dict[str, Any]:
     if not universe:
         raise ValueError("universe must not be empty")
     if initial_capital <= 0:
         raise ValueError("initial_capital must be positive")
+    if world_manifest is not None and (
+        list(world_manifest.universe) != list(universe)
+        or world_manifest.start_date != start_date
+        or world_manifest.end_date != end_date
+    ):
+        raise ValueError("world_manifest does not match requested universe/date range")
 
     validation = validate_code_strategy_source(source_code)
     code_version = sqlite_store.save_code_strategy_version(
@@ -48,26 +63,18 @@ def run_code_strategy_backtest(
         validation=validation,
     )
 
-    placeholders = ",".join(["?"] * len(universe))
-    sql = f"""
-        SELECT symbol, timestamp, close
-        FROM market_ohlcv
-        WHERE symbol IN ({placeholders})
-          AND CAST(timestamp AS DATE) BETWEEN CAST(? AS DATE) AND CAST(? AS DATE)
-        ORDER BY symbol, timestamp
-    """
-    with duckdb.connect(str(paths.duckdb_path)) as conn:
-        rows = conn.execute(sql, [*universe, start_date, end_date]).fetchall()
+    with duckdb_store.shared_cursor(paths) as conn:
+        rows = conn.execute(_BARS_SQL, [universe, start_date, end_date]).fetchall()
     if not rows:
         raise ValueError("no OHLCV rows found for requested universe/date range")
 
     frame: list[dict[str, Any]] = []
     by_symbol: dict[str, list[tuple[str, float]]] = defaultdict(list)
     all_dates: set[str] = set()
-    for symbol, ts, close in rows:
-        date_key = _date_key(ts)
-        frame.append({"symbol": str(symbol), "timestamp": date_key, "close": float(close)})
-        by_symbol[str(symbol)].append((date_key, float(close)))
+    # DuckDB formats the day and returns VARCHAR/DOUBLE columns, so no datetime objects are built per row.
+    for symbol, date_key, close in rows:
+        frame.append({"symbol": symbol, "timestamp": date_key, "close": close})
+        by_symbol[symbol].append((date_key, close))
         all_dates.add(date_key)
 
     sandbox = run_code_strategy_sandbox(
@@ -106,37 +113,43 @@ def run_code_strategy_backtest(
 
     equity_series: list[float] = []
     if not active_symbols:
+        # A strategy that never fired holds cash: flat equity, zero returns and no drawdown.
         equity_series = [initial_capital for _ in ordered_dates]
         trade_count = 0
+        # Same series checks as compute_backtest_metrics, so both paths accept the same windows.
+        validate_equity_series(equity_series)
+        metrics = BacktestMetrics(
+            final_equity=initial_capital,
+            total_return=0.0,
+            cagr=0.0,
+            sharpe=0.0,
+            max_drawdown=0.0,
+            trade_count=0,
+        )
+        drawdowns = [0.0 for _ in ordered_dates]
     else:
         allocation = initial_capital / float(len(active_symbols))
         trade_count = len(active_symbols) * 2
-        last_close_by_symbol: dict[str, float] = {}
-        symbol_points: dict[str, dict[str, float]] = {
-            symbol: {day: close for day, close in points} for symbol, points in by_symbol.items()
-        }
-        first_close_by_symbol: dict[str, float] = {
-            symbol: by_symbol[symbol][0][1] for symbol in active_symbols
-        }
-        for day in ordered_dates:
-            total = 0.0
-            for symbol in active_symbols:
-                if day in symbol_points[symbol]:
-                    last_close_by_symbol[symbol] = symbol_points[symbol][day]
-                close = last_close_by_symbol.get(symbol, first_close_by_symbol[symbol])
-                total += allocation * (close / first_close_by_symbol[symbol])
-            equity_series.append(total)
+        # One forward-filled value column per active symbol, then a C-level elementwise add
+        # per symbol; the additions happen in the same order as a per-day running total.
+        equity_series = [0.0] * len(ordered_dates)
+        for symbol in active_symbols:
+            closes_by_day = dict(by_symbol[symbol])
+            first_close = by_symbol[symbol][0][1]
+            close = first_close
+            values: list[float] = []
+            for day in ordered_dates:
+                close = closes_by_day.get(day, close)
+                values.append(allocation * (close / first_close))
+            equity_series = list(map(operator.add, equity_series, values))
 
-    metrics = compute_backtest_metrics(equity_series, trade_count=trade_count)
-    drawdowns: list[float] = []
-    peak = equity_series[0]
-    for value in equity_series:
-        peak = max(peak, value)
-        drawdowns.append((value / peak) - 1.0)
+        metrics = compute_backtest_metrics(equity_series, trade_count=trade_count)
+        drawdowns = [(value / peak) - 1.0 for value, peak in zip(equity_series, accumulate(equity_series, max))]
 
     run_dir = paths.artifacts_dir / "code-backtests"
     run_dir.mkdir(parents=True, exist_ok=True)
-    temp_id = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S%f")
+    # Tuning runs trials concurrently, so the timestamp alone is not unique.
+    temp_id = f"{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S%f')}-{uuid.uuid4().hex[:8]}"
     equity_path = run_dir / f"equity-{temp_id}.svg"
     drawdown_path = run_dir / f"drawdown-{temp_id}.svg"
     trade_path = run_dir / f"trades-{temp_id}.csv"
@@ -144,28 +157,13 @@ def run_code_strategy_backtest(
     write_line_chart_svg(equity_path, f"Code Strategy Equity - {strategy_name}", ordered_dates, equity_series)
     write_line_chart_svg(drawdown_path, f"Code Strategy Drawdown - {strategy_name}", ordered_dates, drawdowns)
 
-    signal_rows: list[dict[str, Any]] = []
-    for symbol in sorted(by_symbol.keys()):
-        signal_item = next(
-            (item for item in signals if isinstance(item, dict) and str(item.get("symbol")) == symbol),
-            {},
-        )
-        signal_type = str(signal_item.get("signal", "watch")).lower()
-        reason_code = str(signal_item.get("reason_code", f"signal_{signal_type}"))
-        strength = signal_item.get("strength")
-        for day, close in by_symbol[symbol]:
-            signal_rows.append(
-                {
-                    "symbol": symbol,
-                    "timestamp": day,
-                    "close": close,
-                    "signal": signal_type,
-                    "strength": strength if strength is not None else "",
-                    "reason_code": reason_code,
-                }
-            )
+    # One pass over signals instead of a scan per symbol; the first signal for a symbol wins.
+    first_signal_by_symbol: dict[str, dict[str, Any]] = {}
+    for item in signals:
+        if isinstance(item, dict):
+            first_signal_by_symbol.setdefault(str(item.get("symbol")), item)
 
-    trade_rows: list[dict[str, Any]] = []
+    trade_rows: list[tuple[Any, ...]] = []
     for symbol in sorted(active_symbols):
         points = by_symbol[symbol]
         entry_ts, entry_price = points[0]
@@ -174,37 +172,30 @@ def run_code_strategy_backtest(
         qty = 0.0 if entry_price <= 0 else notional / entry_price
         pnl = qty * (exit_price - entry_price)
         trade_rows.append(
-            {
-                "symbol": symbol,
-                "entry_ts": entry_ts,
-                "exit_ts": exit_ts,
-                "entry_price": entry_price,
-                "exit_price": exit_price,
-                "pnl": pnl,
-                "entry_reason": "signal_buy",
-                "exit_reason": "end_of_window",
-            }
+            (symbol, entry_ts, exit_ts, entry_price, exit_price, pnl, "signal_buy", "end_of_window")
         )
 
+    # Rows go to csv.writer as tuples in header order, so writerows formats them in C
+    # without a per-row dict; the bytes match what DictWriter produced.
     with trade_path.open("w", newline="", encoding="utf-8") as handle:
-        writer = csv.DictWriter(
-            handle,
-            fieldnames=["symbol", "entry_ts", "exit_ts", "entry_price", "exit_price", "pnl", "entry_reason", "exit_reason"],
-        )
-        writer.writeheader()
-        for row in trade_rows:
-            writer.writerow(row)
+        writer = csv.writer(handle)
+        writer.writerow(["symbol", "entry_ts", "exit_ts", "entry_price", "exit_price", "pnl", "entry_reason", "exit_reason"])
+        writer.writerows(trade_rows)
 
     with signal_path.open("w", newline="", encoding="utf-8") as handle:
-        writer = csv.DictWriter(
-            handle,
-            fieldnames=["symbol", "timestamp", "close", "signal", "strength", "reason_code"],
-        )
-        writer.writeheader()
-        for row in signal_rows:
-            writer.writerow(row)
+        writer = csv.writer(handle)
+        writer.writerow(["symbol", "timestamp", "close", "signal", "strength", "reason_code"])
+        for symbol in sorted(by_symbol.keys()):
+            signal_item = first_signal_by_symbol.get(symbol, {})
+            signal_type = str(signal_item.get("signal", "watch")).lower()
+            reason_code = str(signal_item.get("reason_code", f"signal_{signal_type}"))
+            strength = signal_item.get("strength")
+            strength_cell = strength if strength is not None else ""
+            writer.writerows(
+                (symbol, day, close, signal_type, strength_cell, reason_code) for day, close in by_symbol[symbol]
+            )
 
-    manifest = build_world_state_manifest(paths, universe, start_date, end_date)
+    manifest = world_manifest or build_world_state_manifest(paths, universe, start_date, end_date)
     run_id = sqlite_store.save_backtest_run(
         paths,
         strategy_version_id=code_version["strategy_version_id"],
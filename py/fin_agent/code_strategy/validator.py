@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import ast
+import hashlib
 import inspect
+import threading
+from collections import OrderedDict
 from typing import Any
 
 
@@ -11,6 +14,12 @@ REQUIRED_SIGNATURES = {
     "risk_rules": 2,
 }
 
+# Digests of sources that already passed the contract check. Only successes are kept,
+# so a failing source is re-checked (and reports its error) every time.
+_VALIDATED_LIMIT = 256
+_VALIDATED_LOCK = threading.Lock()
+_VALIDATED: OrderedDict[str, None] = OrderedDict()
+
 
 def _assert_required_functions_exist(tree: ast.AST) -> None:
     names = {node.name for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)}
@@ -31,9 +40,31 @@ def _assert_callable_signatures(namespace: dict[str, Any]) -> None:
             )
 
 
+def _validation_result() -> dict[str, Any]:
+    return {
+        "valid": True,
+        "required_functions": sorted(REQUIRED_SIGNATURES.keys()),
+    }
+
+
 def validate_code_strategy_source(source_code: str) -> dict[str, Any]:
     if not source_code.strip():
         raise ValueError("source_code is empty")
+    digest = hashlib.sha256(source_code.encode("utf-8")).hexdigest()
+    with _VALIDATED_LOCK:
+        if digest in _VALIDATED:
+            _VALIDATED.move_to_end(digest)
+            return _validation_result()
+
+    _check_code_strategy_contract(source_code)
+    with _VALIDATED_LOCK:
+        _VALIDATED[digest] = None
+        while len(_VALIDATED) > _VALIDATED_LIMIT:
+            _VALIDATED.popitem(last=False)
+    return _validation_result()
+
+
+def _check_code_strategy_contract(source_code: str) -> None:
     try:
         tree = ast.parse(source_code)
     except SyntaxError as exc:
@@ -75,8 +106,3 @@ def validate_code_strategy_source(source_code: str) -> dict[str, Any]:
         raise ValueError(f"risk_rules raised exception during contract check: {exc}") from exc
     if not isinstance(risk_output, dict):
         raise ValueError("risk_rules must return dict")
-
-    return {
-        "valid": True,
-        "required_functions": sorted(REQUIRED_SIGNATURES.keys()),
-    }
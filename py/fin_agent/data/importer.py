@@ -9,6 +9,7 @@ from pathlib import Path
 
 import duckdb
 
+from fin_agent.analysis.preflight import clear_preflight_cache
 from fin_agent.storage import duckdb_store, sqlite_store
 from fin_agent.storage.paths import RuntimePaths
 
@@ -103,7 +104,7 @@ def import_ohlcv_file(path: Path, runtime_paths: RuntimePaths) -> ImportResult:
         _validate_relational_columns(path, relation)
 
     now = datetime.now(timezone.utc).isoformat()
-    with duckdb.connect(str(runtime_paths.duckdb_path)) as conn:
+    with duckdb_store.shared_cursor(runtime_paths, release=True) as conn:
         before = conn.execute("SELECT COUNT(*) FROM market_ohlcv").fetchone()[0]
         conn.execute(
             f"""
@@ -125,6 +126,12 @@ def import_ohlcv_file(path: Path, runtime_paths: RuntimePaths) -> ImportResult:
             [str(path), dataset_hash, now],
         )
         after = conn.execute("SELECT COUNT(*) FROM market_ohlcv").fetchone()[0]
+        symbols = conn.execute(
+            "SELECT DISTINCT symbol FROM market_ohlcv WHERE source_file = ? AND ingested_at = CAST(? AS TIMESTAMP)",
+            [str(path), now],
+        ).fetchall()
+        duckdb_store.refresh_ohlcv_summary(conn, [row[0] for row in symbols])
+    clear_preflight_cache()
 
     rows_inserted = int(after - before)
     if rows_inserted <= 0:
@@ -153,7 +160,7 @@ def import_fundamentals_file(path: Path, runtime_paths: RuntimePaths) -> ImportR
 
     duckdb_store.init_db(runtime_paths)
     sqlite_store.init_db(runtime_paths)
-    with duckdb.connect(str(runtime_paths.duckdb_path)) as conn:
+    with duckdb_store.shared_cursor(runtime_paths, release=True) as conn:
         before = conn.execute("SELECT COUNT(*) FROM company_fundamentals").fetchone()[0]
         conn.execute(
             f"""
@@ -200,7 +207,7 @@ def import_corporate_actions_file(path: Path, runtime_paths: RuntimePaths) -> Im
 
     duckdb_store.init_db(runtime_paths)
     sqlite_store.init_db(runtime_paths)
-    with duckdb.connect(str(runtime_paths.duckdb_path)) as conn:
+    with duckdb_store.shared_cursor(runtime_paths, release=True) as conn:
         before = conn.execute("SELECT COUNT(*) FROM corporate_actions").fetchone()[0]
         conn.execute(
             f"""
@@ -247,7 +254,7 @@ def import_ratings_file(path: Path, runtime_paths: RuntimePaths) -> ImportResult
 
     duckdb_store.init_db(runtime_paths)
     sqlite_store.init_db(runtime_paths)
-    with duckdb.connect(str(runtime_paths.duckdb_path)) as conn:
+    with duckdb_store.shared_cursor(runtime_paths, release=True) as conn:
         before = conn.execute("SELECT COUNT(*) FROM analyst_ratings").fetchone()[0]
         conn.execute(
             f"""
@@ -289,7 +296,7 @@ def query_fundamentals_as_of(runtime_paths: RuntimePaths, symbol: str, as_of: st
     if not as_of.strip():
         raise ValueError("as_of is required")
     duckdb_store.init_db(runtime_paths)
-    with duckdb.connect(str(runtime_paths.duckdb_path)) as conn:
+    with duckdb_store.shared_cursor(runtime_paths) as conn:
         row = conn.execute(
             """
             SELECT symbol, published_at, pe_ratio, eps, payload_json
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
-import duckdb
-
+from fin_agent.storage import duckdb_store
 from fin_agent.storage.paths import RuntimePaths
 
 
@@ -19,7 +18,7 @@ def compute_sma_features(
         raise ValueError("universe must not be empty")
 
     placeholders = ",".join(["?"] * len(universe))
-    with duckdb.connect(str(runtime_paths.duckdb_path)) as conn:
+    with duckdb_store.shared_cursor(runtime_paths, release=True) as conn:
         conn.execute("DELETE FROM market_technicals WHERE source = 'stage1_sma'")
         before = conn.execute("SELECT COUNT(*) FROM market_technicals").fetchone()[0]
         conn.execute(
@@ -41,7 +40,8 @@ def compute_sma_features(
               'stage1_sma'
             FROM market_ohlcv
             WHERE symbol IN ({placeholders})
-              AND CAST(timestamp AS DATE) BETWEEN CAST(? AS DATE) AND CAST(? AS DATE)
+              AND timestamp >= CAST(CAST(? AS DATE) AS TIMESTAMP)
+              AND timestamp < CAST(CAST(? AS DATE) AS TIMESTAMP) + INTERVAL 1 DAY
             ORDER BY symbol, timestamp
             """,
             [*universe, start_date, end_date],
@@ -1,14 +1,37 @@
 from __future__ import annotations
 
+import copy
+import hashlib
+import heapq
+import json
+import threading
+from collections import OrderedDict
 from datetime import datetime, timezone
 from typing import Any
 
-import duckdb
-
 from fin_agent.code_strategy.runner import run_code_strategy_sandbox
+from fin_agent.storage import duckdb_store
 from fin_agent.storage.paths import RuntimePaths
 from fin_agent.viz.svg import write_line_chart_svg
 
+# Sandbox signal outputs keyed by a digest of everything the strategy sees: the
+# source, universe, end date, sandbox limits and the loaded frame itself. New
+# market data or a new strategy version changes the key, so no invalidation is needed.
+_SIGNAL_CACHE_LIMIT = 64
+_SIGNAL_CACHE_LOCK = threading.Lock()
+_SIGNAL_CACHE: OrderedDict[str, list[Any]] = OrderedDict()
+
+
+# Universe and lookback are bound parameters, so the statement text never varies.
+_FRAME_SQL = """
+    SELECT symbol, CAST(timestamp AS DATE) AS day, close
+    FROM market_ohlcv
+    WHERE list_contains(CAST(? AS VARCHAR[]), symbol)
+      AND timestamp >= CAST(CAST(? AS DATE) - to_days(CAST(? AS INTEGER)) AS TIMESTAMP)
+      AND timestamp < CAST(CAST(? AS DATE) AS TIMESTAMP) + INTERVAL 1 DAY
+    ORDER BY symbol, timestamp
+"""
+
 
 def _to_date_key(value: Any) -> str:
     if hasattr(value, "strftime"):
@@ -24,16 +47,8 @@ def _load_frame(
 ) -> list[dict[str, Any]]:
     if not universe:
         raise ValueError("universe must not be empty for live snapshot")
-    placeholders = ",".join(["?"] * len(universe))
-    sql = f"""
-        SELECT symbol, CAST(timestamp AS DATE) AS day, close
-        FROM market_ohlcv
-        WHERE symbol IN ({placeholders})
-          AND CAST(timestamp AS DATE) BETWEEN CAST(? AS DATE) - INTERVAL '{int(lookback_days)} days' AND CAST(? AS DATE)
-        ORDER BY symbol, timestamp
-    """
-    with duckdb.connect(str(paths.duckdb_path)) as conn:
-        rows = conn.execute(sql, [*universe, end_date, end_date]).fetchall()
+    with duckdb_store.shared_cursor(paths) as conn:
+        rows = conn.execute(_FRAME_SQL, [universe, end_date, int(lookback_days), end_date]).fetchall()
     frame: list[dict[str, Any]] = []
     for symbol, day, close in rows:
         frame.append(
@@ -46,6 +61,28 @@ def _load_frame(
     return frame
 
 
+def _signal_cache_key(
+    *,
+    source_code: str,
+    universe: list[str],
+    end_date: str,
+    limits: tuple[int, int, int],
+    frame: list[dict[str, Any]],
+) -> str:
+    digest = hashlib.sha256()
+    digest.update(source_code.encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(json.dumps([universe, end_date, list(limits)]).encode("utf-8"))
+    for row in frame:
+        digest.update(f"\x00{row['symbol']}\x1f{row['timestamp']}\x1f{row['close']!r}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def clear_signal_cache() -> None:
+    with _SIGNAL_CACHE_LOCK:
+        _SIGNAL_CACHE.clear()
+
+
 def build_live_snapshot(
     paths: RuntimePaths,
     *,
@@ -61,20 +98,38 @@ def build_live_snapshot(
     if not frame:
         raise ValueError("no OHLCV rows available for live snapshot")
 
-    sandbox = run_code_strategy_sandbox(
-        paths=paths,
+    cache_key = _signal_cache_key(
         source_code=source_code,
-        timeout_seconds=timeout_seconds,
-        memory_mb=memory_mb,
-        cpu_seconds=cpu_seconds,
-        data_bundle={"universe": universe},
+        universe=universe,
+        end_date=end_date,
+        limits=(timeout_seconds, memory_mb, cpu_seconds),
         frame=frame,
-        context={"mode": "live", "end_date": end_date},
     )
-    outputs = sandbox.get("outputs", {})
-    signal_rows = outputs.get("signals")
-    if not isinstance(signal_rows, list):
-        raise ValueError("strategy generate_signals must return list for live snapshot")
+    with _SIGNAL_CACHE_LOCK:
+        cached = _SIGNAL_CACHE.get(cache_key)
+        if cached is not None:
+            _SIGNAL_CACHE.move_to_end(cache_key)
+    if cached is not None:
+        signal_rows = copy.deepcopy(cached)
+    else:
+        sandbox = run_code_strategy_sandbox(
+            paths=paths,
+            source_code=source_code,
+            timeout_seconds=timeout_seconds,
+            memory_mb=memory_mb,
+            cpu_seconds=cpu_seconds,
+            data_bundle={"universe": universe},
+            frame=frame,
+            context={"mode": "live", "end_date": end_date},
+        )
+        outputs = sandbox.get("outputs", {})
+        signal_rows = outputs.get("signals")
+        if not isinstance(signal_rows, list):
+            raise ValueError("strategy generate_signals must return list for live snapshot")
+        with _SIGNAL_CACHE_LOCK:
+            _SIGNAL_CACHE[cache_key] = copy.deepcopy(signal_rows)
+            while len(_SIGNAL_CACHE) > _SIGNAL_CACHE_LIMIT:
+                _SIGNAL_CACHE.popitem(last=False)
 
     latest_by_symbol: dict[str, tuple[str, float]] = {}
     for row in frame:
@@ -128,14 +183,14 @@ def build_live_snapshot(
 def boundary_candidates(snapshot: list[dict[str, Any]], top_k: int) -> list[dict[str, Any]]:
     if top_k <= 0:
         raise ValueError("top_k must be positive")
-    ordered = sorted(
+    return heapq.nsmallest(
+        top_k,
         snapshot,
         key=lambda row: (
             float(row["abs_distance_to_boundary"]),
             str(row["symbol"]),
         ),
     )
-    return ordered[:top_k]
 
 
 def write_boundary_chart(
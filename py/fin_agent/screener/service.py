@@ -1,8 +1,7 @@
 from __future__ import annotations
 
-import duckdb
-
 from fin_agent.screener.formula import FormulaValidation, validate_and_compile_formula
+from fin_agent.storage import duckdb_store
 from fin_agent.storage.paths import RuntimePaths
 
 ALLOWED_COLUMNS = [
@@ -60,7 +59,7 @@ def run_formula_screen(
         ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY timestamp DESC) AS rn
       FROM market_ohlcv
       WHERE symbol IN ({placeholders})
-        AND CAST(timestamp AS DATE) <= CAST(? AS DATE)
+        AND timestamp < CAST(CAST(? AS DATE) AS TIMESTAMP) + INTERVAL 1 DAY
     ),
     latest_tech AS (
       SELECT
@@ -70,7 +69,7 @@ def run_formula_screen(
         ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY timestamp DESC) AS rn
       FROM market_technicals
       WHERE symbol IN ({placeholders})
-        AND CAST(timestamp AS DATE) <= CAST(? AS DATE)
+        AND timestamp < CAST(CAST(? AS DATE) AS TIMESTAMP) + INTERVAL 1 DAY
     ),
     previous_price AS (
       SELECT
@@ -79,7 +78,7 @@ def run_formula_screen(
         ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY timestamp DESC) AS rn
       FROM market_ohlcv
       WHERE symbol IN ({placeholders})
-        AND CAST(timestamp AS DATE) <= CAST(? AS DATE)
+        AND timestamp < CAST(CAST(? AS DATE) AS TIMESTAMP) + INTERVAL 1 DAY
     ),
     base AS (
       SELECT
@@ -118,7 +117,7 @@ def run_formula_screen(
     """
 
     params: list[object] = [*universe, as_of, *universe, as_of, *universe, as_of, top_k]
-    with duckdb.connect(str(runtime_paths.duckdb_path)) as conn:
+    with duckdb_store.shared_cursor(runtime_paths) as conn:
         rows = conn.execute(sql, params).fetchall()
         columns = [row[0] for row in conn.description]
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Any
 
 _SECRET_KEYS = {
@@ -24,15 +25,24 @@ def _mask(value: str) -> str:
     return f"{value[:4]}...{value[-4:]}"
 
 
+@lru_cache(maxsize=4096)
+def _is_secret_key(key: str) -> bool:
+    # Payload keys come from a small fixed vocabulary, so the substring scan runs once per key.
+    lowered = key.lower()
+    return any(secret in lowered for secret in _SECRET_KEYS)
+
+
 def redact_payload(payload: Any) -> Any:
     if isinstance(payload, dict):
         out: dict[str, Any] = {}
         for key, value in payload.items():
-            k = str(key).lower()
-            if any(secret in k for secret in _SECRET_KEYS):
-                out[str(key)] = _mask(str(value))
+            name = str(key)
+            if _is_secret_key(name):
+                out[name] = _mask(str(value))
+            elif isinstance(value, (dict, list)):
+                out[name] = redact_payload(value)
             else:
-                out[str(key)] = redact_payload(value)
+                out[name] = value
         return out
     if isinstance(payload, list):
         return [redact_payload(item) for item in payload]
@@ -1,15 +1,120 @@
 from __future__ import annotations
 
+import atexit
+import json
+import tempfile
+import threading
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
 import duckdb
 
 from fin_agent.storage.paths import RuntimePaths
 
+# Seconds an unused shared connection stays open before its file lock is released.
+_SHARED_IDLE_SECONDS = 5.0
+_SHARED_LOCK = threading.Lock()
+
+
+@dataclass
+class _SharedConnection:
+    conn: duckdb.DuckDBPyConnection
+    users: int = 0
+    idle_timer: threading.Timer | None = None
+
+
+_SHARED_CONNECTIONS: dict[str, _SharedConnection] = {}
+
 
 def _connect(paths: RuntimePaths) -> duckdb.DuckDBPyConnection:
     paths.ensure()
     return duckdb.connect(str(paths.duckdb_path))
 
 
+def _close_idle_connection(key: str) -> None:
+    with _SHARED_LOCK:
+        entry = _SHARED_CONNECTIONS.get(key)
+        # A timer cancelled after it fired must not close a connection that was reused.
+        if entry is None or entry.users or entry.idle_timer is not threading.current_thread():
+            return
+        del _SHARED_CONNECTIONS[key]
+        entry.conn.close()
+
+
+@contextmanager
+def shared_cursor(paths: RuntimePaths, *, release: bool = False) -> Iterator[duckdb.DuckDBPyConnection]:
+    """Yield a cursor on the process-wide connection for ``paths.duckdb_path``.
+
+    The database is opened once and kept warm; every caller gets its own cursor so
+    request threads never share a connection object. Once no cursor is in use the
+    connection closes after ``_SHARED_IDLE_SECONDS``, dropping DuckDB's file lock so
+    other processes (CLI imports, scripts) can open the file. Writers pass
+    ``release=True`` to drop the lock as soon as they finish.
+    """
+    key = str(paths.duckdb_path)
+    with _SHARED_LOCK:
+        entry = _SHARED_CONNECTIONS.get(key)
+        if entry is None:
+            paths.ensure()
+            entry = _SharedConnection(conn=duckdb.connect(key))
+            _SHARED_CONNECTIONS[key] = entry
+        if entry.idle_timer is not None:
+            entry.idle_timer.cancel()
+            entry.idle_timer = None
+        entry.users += 1
+        cursor = entry.conn.cursor()
+    try:
+        yield cursor
+    finally:
+        cursor.close()
+        with _SHARED_LOCK:
+            entry.users -= 1
+            if entry.users == 0:
+                if release:
+                    del _SHARED_CONNECTIONS[key]
+                    entry.conn.close()
+                else:
+                    entry.idle_timer = threading.Timer(_SHARED_IDLE_SECONDS, _close_idle_connection, args=(key,))
+                    entry.idle_timer.daemon = True
+                    entry.idle_timer.start()
+
+
+def close_shared_connections() -> None:
+    with _SHARED_LOCK:
+        while _SHARED_CONNECTIONS:
+            _, entry = _SHARED_CONNECTIONS.popitem()
+            if entry.idle_timer is not None:
+                entry.idle_timer.cancel()
+            entry.conn.close()
+
+
+atexit.register(close_shared_connections)
+
+
+@contextmanager
+def staged_rows(columns: dict[str, str], rows: Iterable[Sequence[Any]]) -> Iterator[tuple[str, str]]:
+    """Stage ``rows`` in a temporary JSONL file and yield ``(relation, path)`` over it.
+
+    ``columns`` maps column names to DuckDB types in row order. ``relation`` is a
+    ``read_json(?, ...)`` scan whose ``?`` must be bound to ``path``; the path is never
+    spliced into SQL text. Inserting with ``INSERT ... SELECT ... FROM <relation>`` loads
+    every row in one vectorized scan instead of binding parameters row by row; JSON
+    keeps NULL distinct from ''.
+    """
+    names = list(columns)
+    with tempfile.TemporaryDirectory(prefix="fin-agent-stage-") as tmp_dir:
+        path = Path(tmp_dir) / "rows.jsonl"
+        with path.open("w", encoding="utf-8") as handle:
+            for row in rows:
+                handle.write(json.dumps(dict(zip(names, row)), default=str))
+                handle.write("\n")
+        spec = ", ".join(f"'{name}': '{kind}'" for name, kind in columns.items())
+        yield f"read_json(?, format='newline_delimited', columns={{{spec}}})", path.as_posix()
+
+
 def init_db(paths: RuntimePaths) -> None:
     with _connect(paths) as conn:
         conn.execute(
@@ -31,6 +136,19 @@ def init_db(paths: RuntimePaths) -> None:
         )
         conn.execute("ALTER TABLE market_ohlcv ADD COLUMN IF NOT EXISTS published_at TIMESTAMP")
         conn.execute("UPDATE market_ohlcv SET published_at = timestamp WHERE published_at IS NULL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS market_ohlcv_summary (
+                symbol VARCHAR NOT NULL,
+                min_ts TIMESTAMP NOT NULL,
+                max_ts TIMESTAMP NOT NULL,
+                row_count BIGINT NOT NULL
+            )
+            """
+        )
+        summary_rows = conn.execute("SELECT COUNT(*) FROM market_ohlcv_summary").fetchone()[0]
+        if int(summary_rows) == 0:
+            refresh_ohlcv_summary(conn)
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS market_technicals (
@@ -117,8 +235,45 @@ def init_db(paths: RuntimePaths) -> None:
         )
 
 
+def refresh_ohlcv_summary(conn: duckdb.DuckDBPyConnection, symbols: Sequence[str] | None = None) -> None:
+    """Refresh the per-symbol min/max/count summary used by preflight estimates.
+
+    Call on the same connection right after writing to ``market_ohlcv``. Pass the
+    symbols just written so only their summary rows are rebuilt; ``None`` rebuilds
+    the whole table.
+    """
+    if symbols is None:
+        conn.execute("DELETE FROM market_ohlcv_summary")
+        conn.execute(
+            """
+            INSERT INTO market_ohlcv_summary (symbol, min_ts, max_ts, row_count)
+            SELECT symbol, MIN(timestamp), MAX(timestamp), COUNT(*)
+            FROM market_ohlcv
+            GROUP BY symbol
+            """
+        )
+        return
+    symbols = list(symbols)
+    if not symbols:
+        return
+    conn.execute(
+        "DELETE FROM market_ohlcv_summary WHERE list_contains(CAST(? AS VARCHAR[]), symbol)",
+        [symbols],
+    )
+    conn.execute(
+        """
+        INSERT INTO market_ohlcv_summary (symbol, min_ts, max_ts, row_count)
+        SELECT symbol, MIN(timestamp), MAX(timestamp), COUNT(*)
+        FROM market_ohlcv
+        WHERE list_contains(CAST(? AS VARCHAR[]), symbol)
+        GROUP BY symbol
+        """,
+        [symbols],
+    )
+
+
 def query_ohlcv_count(paths: RuntimePaths, symbol: str) -> int:
-    with _connect(paths) as conn:
+    with shared_cursor(paths) as conn:
         row = conn.execute(
             "SELECT COUNT(*) AS c FROM market_ohlcv WHERE symbol = ?", (symbol,)
         ).fetchone()
@@ -25,6 +25,13 @@ class RuntimePaths:
         return self.root / "logs"
 
     def ensure(self) -> None:
+        # Store connections call this on every open; after the first call for a root it is one set lookup.
+        if self.root in _ENSURED_ROOTS and self.root.is_dir():
+            return
         self.root.mkdir(parents=True, exist_ok=True)
         self.artifacts_dir.mkdir(parents=True, exist_ok=True)
         self.logs_dir.mkdir(parents=True, exist_ok=True)
+        _ENSURED_ROOTS.add(self.root)
+
+
+_ENSURED_ROOTS: set[Path] = set()
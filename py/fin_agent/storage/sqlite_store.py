@@ -20,6 +20,15 @@ class StrategyVersionRef:
     version_number: int
 
 
+# Tuning payloads are JSON-shaped trees built from request input and metrics, so the
+# C encoder can skip its circular-reference bookkeeping; output matches json.dumps.
+_TUNING_JSON_ENCODER = json.JSONEncoder(check_circular=False)
+
+
+def _dump_tuning_json(value: Any) -> str:
+    return _TUNING_JSON_ENCODER.encode(value)
+
+
 def _utc_now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
@@ -35,6 +44,10 @@ def connect(paths: RuntimePaths) -> Generator[sqlite3.Connection, None, None]:
     paths.ensure()
     conn = sqlite3.connect(paths.sqlite_path)
     conn.row_factory = sqlite3.Row
+    # WAL is set once by init_db and persists in the file; these settings are per connection.
+    # In WAL mode NORMAL syncs at checkpoints rather than on every commit.
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
     try:
         yield conn
     finally:
@@ -43,6 +56,8 @@ def connect(paths: RuntimePaths) -> Generator[sqlite3.Connection, None, None]:
 
 def init_db(paths: RuntimePaths) -> None:
     with connect(paths) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA journal_size_limit=6144000")
         conn.executescript(
             """
             CREATE TABLE IF NOT EXISTS intent_snapshots (
@@ -418,6 +433,18 @@ def save_backtest_run(
     return run_id
 
 
+def _backtest_run_from_row(row: sqlite3.Row) -> dict[str, Any]:
+    return {
+        "run_id": row["id"],
+        "strategy_version_id": row["strategy_version_id"],
+        "world_manifest_id": row["world_manifest_id"],
+        "metrics": json.loads(row["metrics_json"]),
+        "artifacts": json.loads(row["artifacts_json"]),
+        "payload": json.loads(row["payload_json"]),
+        "created_at": row["created_at"],
+    }
+
+
 def get_backtest_run(paths: RuntimePaths, run_id: str) -> dict[str, Any]:
     with connect(paths) as conn:
         row = conn.execute(
@@ -430,15 +457,53 @@ def get_backtest_run(paths: RuntimePaths, run_id: str) -> dict[str, Any]:
         ).fetchone()
     if row is None:
         raise ValueError(f"backtest_run not found: {run_id}")
-    return {
-        "run_id": row["id"],
-        "strategy_version_id": row["strategy_version_id"],
-        "world_manifest_id": row["world_manifest_id"],
-        "metrics": json.loads(row["metrics_json"]),
-        "artifacts": json.loads(row["artifacts_json"]),
-        "payload": json.loads(row["payload_json"]),
-        "created_at": row["created_at"],
-    }
+    return _backtest_run_from_row(row)
+
+
+def get_backtest_run_summaries(paths: RuntimePaths, run_ids: list[str]) -> list[dict[str, Any]]:
+    """Load runs in request order with only the payload's ``strategy`` object.
+
+    The payload can carry the full signal list, so SQLite extracts the strategy
+    server-side instead of returning and decoding the whole document.
+    """
+    if not run_ids:
+        return []
+    unique_ids = list(dict.fromkeys(run_ids))
+    placeholders = ",".join(["?"] * len(unique_ids))
+    with connect(paths) as conn:
+        rows = conn.execute(
+            f"""
+            SELECT
+                id,
+                strategy_version_id,
+                world_manifest_id,
+                metrics_json,
+                artifacts_json,
+                json_extract(payload_json, '$.strategy') AS strategy_json,
+                created_at
+            FROM backtest_runs
+            WHERE id IN ({placeholders})
+            """,
+            unique_ids,
+        ).fetchall()
+    by_id = {row["id"]: row for row in rows}
+    for run_id in run_ids:
+        if run_id not in by_id:
+            raise ValueError(f"backtest_run not found: {run_id}")
+    decoded: dict[str, dict[str, Any]] = {}
+    for run_id in unique_ids:
+        row = by_id[run_id]
+        strategy = json.loads(row["strategy_json"]) if row["strategy_json"] else {}
+        decoded[run_id] = {
+            "run_id": row["id"],
+            "strategy_version_id": row["strategy_version_id"],
+            "world_manifest_id": row["world_manifest_id"],
+            "metrics": json.loads(row["metrics_json"]),
+            "artifacts": json.loads(row["artifacts_json"]),
+            "strategy": strategy if isinstance(strategy, dict) else {},
+            "created_at": row["created_at"],
+        }
+    return [decoded[run_id] for run_id in run_ids]
 
 
 def list_backtest_runs(
@@ -502,6 +567,9 @@ def save_code_strategy_version(
         raise ValueError("source_code is required")
 
     with connect(paths) as conn:
+        # Take the write lock before the lookups so concurrent saves (parallel tuning
+        # trials) cannot both create the strategy or claim the same version number.
+        conn.execute("BEGIN IMMEDIATE")
         row = conn.execute(
             "SELECT id FROM code_strategies WHERE name = ?",
             (strategy_name,),
@@ -644,84 +712,91 @@ def save_tuning_run(paths: RuntimePaths, strategy_name: str, payload: dict[str,
     if not strategy_name.strip():
         raise ValueError("strategy_name is required")
     run_id = str(payload.get("tuning_run_id", "")).strip() or str(uuid.uuid4())
+    created_at = _utc_now()
+
+    trial_rows: list[tuple[Any, ...]] = []
+    evaluated = payload.get("evaluated_candidates")
+    if evaluated is not None:
+        if not isinstance(evaluated, list):
+            raise ValueError("tuning payload evaluated_candidates must be a list when provided")
+        for row in evaluated:
+            if not isinstance(row, dict):
+                raise ValueError("tuning payload evaluated_candidates rows must be objects")
+            backtest_run_id = str(row.get("run_id", "")).strip()
+            params = row.get("params")
+            metrics = row.get("metrics")
+            if not backtest_run_id:
+                raise ValueError("tuning payload evaluated candidate missing run_id")
+            if not isinstance(params, dict):
+                raise ValueError("tuning payload evaluated candidate params must be object")
+            if not isinstance(metrics, dict):
+                raise ValueError("tuning payload evaluated candidate metrics must be object")
+            score = row.get("score")
+            try:
+                score_value = float(score)
+            except (TypeError, ValueError) as exc:
+                raise ValueError(f"tuning payload evaluated candidate score must be numeric: {score}") from exc
+            trial_rows.append(
+                (
+                    run_id,
+                    backtest_run_id,
+                    _dump_tuning_json(params),
+                    _dump_tuning_json(metrics),
+                    score_value,
+                    created_at,
+                )
+            )
+
+    layer_rows: list[tuple[Any, ...]] = []
+    tuning_plan = payload.get("tuning_plan")
+    if tuning_plan is not None:
+        if not isinstance(tuning_plan, dict):
+            raise ValueError("tuning payload tuning_plan must be object when provided")
+        layers = tuning_plan.get("layers")
+        if layers is not None:
+            if not isinstance(layers, list):
+                raise ValueError("tuning payload tuning_plan.layers must be list when provided")
+            for layer in layers:
+                if not isinstance(layer, dict):
+                    raise ValueError("tuning payload tuning_plan.layers rows must be objects")
+                layer_name = str(layer.get("layer", "")).strip()
+                reason = str(layer.get("reason", "")).strip()
+                enabled = bool(layer.get("enabled", False))
+                if not layer_name:
+                    raise ValueError("tuning payload layer decision missing layer")
+                if not reason:
+                    raise ValueError(f"tuning payload layer decision missing reason for layer={layer_name}")
+                layer_rows.append(
+                    (run_id, layer_name, 1 if enabled else 0, reason, _dump_tuning_json(layer), created_at)
+                )
+
+    # Everything is validated up front so the run, its trials and layer decisions land in one commit.
     with connect(paths) as conn:
         conn.execute(
             """
             INSERT INTO tuning_runs (id, strategy_name, payload_json, created_at)
             VALUES (?, ?, ?, ?)
             """,
-            (run_id, strategy_name, json.dumps(payload), _utc_now()),
+            (run_id, strategy_name, _dump_tuning_json(payload), created_at),
         )
-        evaluated = payload.get("evaluated_candidates")
-        if evaluated is not None:
-            if not isinstance(evaluated, list):
-                raise ValueError("tuning payload evaluated_candidates must be a list when provided")
-            for row in evaluated:
-                if not isinstance(row, dict):
-                    raise ValueError("tuning payload evaluated_candidates rows must be objects")
-                backtest_run_id = str(row.get("run_id", "")).strip()
-                params = row.get("params")
-                metrics = row.get("metrics")
-                if not backtest_run_id:
-                    raise ValueError("tuning payload evaluated candidate missing run_id")
-                if not isinstance(params, dict):
-                    raise ValueError("tuning payload evaluated candidate params must be object")
-                if not isinstance(metrics, dict):
-                    raise ValueError("tuning payload evaluated candidate metrics must be object")
-                score = row.get("score")
-                try:
-                    score_value = float(score)
-                except (TypeError, ValueError) as exc:
-                    raise ValueError(f"tuning payload evaluated candidate score must be numeric: {score}") from exc
-                conn.execute(
-                    """
-                    INSERT INTO tuning_trials
-                      (tuning_run_id, backtest_run_id, params_json, metrics_json, score, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        run_id,
-                        backtest_run_id,
-                        json.dumps(params),
-                        json.dumps(metrics),
-                        score_value,
-                        _utc_now(),
-                    ),
-                )
-
-        tuning_plan = payload.get("tuning_plan")
-        if tuning_plan is not None:
-            if not isinstance(tuning_plan, dict):
-                raise ValueError("tuning payload tuning_plan must be object when provided")
-            layers = tuning_plan.get("layers")
-            if layers is not None:
-                if not isinstance(layers, list):
-                    raise ValueError("tuning payload tuning_plan.layers must be list when provided")
-                for layer in layers:
-                    if not isinstance(layer, dict):
-                        raise ValueError("tuning payload tuning_plan.layers rows must be objects")
-                    layer_name = str(layer.get("layer", "")).strip()
-                    reason = str(layer.get("reason", "")).strip()
-                    enabled = bool(layer.get("enabled", False))
-                    if not layer_name:
-                        raise ValueError("tuning payload layer decision missing layer")
-                    if not reason:
-                        raise ValueError(f"tuning payload layer decision missing reason for layer={layer_name}")
-                    conn.execute(
-                        """
-                        INSERT INTO tuning_layer_decisions
-                          (tuning_run_id, layer_name, enabled, reason, payload_json, created_at)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                        """,
-                        (
-                            run_id,
-                            layer_name,
-                            1 if enabled else 0,
-                            reason,
-                            json.dumps(layer),
-                            _utc_now(),
-                        ),
-                    )
+        if trial_rows:
+            conn.executemany(
+                """
+                INSERT INTO tuning_trials
+                  (tuning_run_id, backtest_run_id, params_json, metrics_json, score, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                trial_rows,
+            )
+        if layer_rows:
+            conn.executemany(
+                """
+                INSERT INTO tuning_layer_decisions
+                  (tuning_run_id, layer_name, enabled, reason, payload_json, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                layer_rows,
+            )
         conn.commit()
     return run_id
 
@@ -736,21 +811,55 @@ def _merge_payload(base: dict[str, Any], updates: dict[str, Any]) -> dict[str, A
     return merged
 
 
-def update_tuning_run(paths: RuntimePaths, tuning_run_id: str, updates: dict[str, Any]) -> None:
+def _require_tuning_run_updates(tuning_run_id: str, updates: dict[str, Any]) -> None:
     if not tuning_run_id.strip():
         raise ValueError("tuning_run_id is required")
     if not isinstance(updates, dict):
         raise ValueError("tuning run updates must be an object")
+
+
+def _write_tuning_run_updates(conn: sqlite3.Connection, tuning_run_id: str, updates: dict[str, Any]) -> None:
+    row = conn.execute("SELECT payload_json FROM tuning_runs WHERE id = ?", (tuning_run_id,)).fetchone()
+    if row is None:
+        raise ValueError(f"tuning_run not found: {tuning_run_id}")
+    updated_payload = _merge_payload(json.loads(row["payload_json"]), updates)
+    conn.execute(
+        "UPDATE tuning_runs SET payload_json = ? WHERE id = ?",
+        (_dump_tuning_json(updated_payload), tuning_run_id),
+    )
+
+
+def _require_tuning_run_exists(conn: sqlite3.Connection, tuning_run_id: str) -> None:
+    # Trials stream in one per candidate; checking the key avoids decoding the run payload each time.
+    if conn.execute("SELECT 1 FROM tuning_runs WHERE id = ?", (tuning_run_id,)).fetchone() is None:
+        raise ValueError(f"tuning_run not found: {tuning_run_id}")
+
+
+def update_tuning_run(paths: RuntimePaths, tuning_run_id: str, updates: dict[str, Any]) -> None:
+    _require_tuning_run_updates(tuning_run_id, updates)
     if not updates:
         return
 
-    current = get_tuning_run(paths, tuning_run_id)["payload"]
-    updated_payload = _merge_payload(current, updates)
+    with connect(paths) as conn:
+        _write_tuning_run_updates(conn, tuning_run_id, updates)
+        conn.commit()
+
 
+def update_tuning_run_with_audit(
+    paths: RuntimePaths,
+    tuning_run_id: str,
+    updates: dict[str, Any],
+    event_type: str,
+    audit_payload: dict[str, Any],
+) -> None:
+    """Apply tuning run updates and append the matching audit event in one transaction."""
+    _require_tuning_run_updates(tuning_run_id, updates)
     with connect(paths) as conn:
+        if updates:
+            _write_tuning_run_updates(conn, tuning_run_id, updates)
         conn.execute(
-            "UPDATE tuning_runs SET payload_json = ? WHERE id = ?",
-            (json.dumps(updated_payload), tuning_run_id),
+            "INSERT INTO audit_events (event_type, payload_json, created_at) VALUES (?, ?, ?)",
+            _audit_event_row(event_type, audit_payload),
         )
         conn.commit()
 
@@ -775,8 +884,8 @@ def append_tuning_trial(
         score_value = float(score)
     except (TypeError, ValueError) as exc:
         raise ValueError("tuning trial score must be numeric") from exc
-    _ = get_tuning_run(paths, tuning_run_id)
     with connect(paths) as conn:
+        _require_tuning_run_exists(conn, tuning_run_id)
         conn.execute(
             """
             INSERT INTO tuning_trials
@@ -786,8 +895,8 @@ def append_tuning_trial(
             (
                 tuning_run_id,
                 backtest_run_id,
-                json.dumps(params),
-                json.dumps(metrics),
+                _dump_tuning_json(params),
+                _dump_tuning_json(metrics),
                 score_value,
                 _utc_now(),
             ),
@@ -813,8 +922,8 @@ def append_tuning_layer_decision(
         raise ValueError("reason is required")
     if not isinstance(payload, dict):
         raise ValueError("tuning layer payload must be an object")
-    _ = get_tuning_run(paths, tuning_run_id)
     with connect(paths) as conn:
+        _require_tuning_run_exists(conn, tuning_run_id)
         conn.execute(
             """
             INSERT INTO tuning_layer_decisions
@@ -826,7 +935,7 @@ def append_tuning_layer_decision(
                 layer_name,
                 1 if enabled else 0,
                 reason,
-                json.dumps(payload),
+                _dump_tuning_json(payload),
                 _utc_now(),
             ),
         )
@@ -982,6 +1091,31 @@ def upsert_live_state(
         conn.commit()
 
 
+def set_live_status(
+    paths: RuntimePaths,
+    strategy_version_id: str,
+    status: str,
+    timestamp_key: str,
+    timestamp: str,
+) -> None:
+    """Set ``status`` and stamp ``payload[timestamp_key]`` in one UPDATE, without reading the payload back."""
+    if status not in {"active", "paused", "stopped"}:
+        raise ValueError("status must be one of: active, paused, stopped")
+    with connect(paths) as conn:
+        row = conn.execute(
+            """
+            UPDATE live_states
+            SET status = ?, payload_json = json_set(payload_json, ?, ?), updated_at = ?
+            WHERE strategy_version_id = ?
+            RETURNING strategy_version_id
+            """,
+            (status, f"$.{timestamp_key}", timestamp, _utc_now(), strategy_version_id),
+        ).fetchone()
+        conn.commit()
+    if row is None:
+        raise ValueError(f"live_state not found for strategy_version_id={strategy_version_id}")
+
+
 def get_live_state(paths: RuntimePaths, strategy_version_id: str) -> dict[str, Any]:
     with connect(paths) as conn:
         row = conn.execute(
@@ -1059,6 +1193,39 @@ def append_live_insight(
         conn.commit()
 
 
+def append_live_insights(
+    paths: RuntimePaths,
+    strategy_version_id: str,
+    rows: list[dict[str, Any]],
+) -> int:
+    created_at = _utc_now()
+    insight_rows = [
+        (
+            strategy_version_id,
+            str(row["action"]),
+            str(row["symbol"]),
+            str(row["reason_code"]),
+            float(row["score"]),
+            json.dumps(row),
+            created_at,
+        )
+        for row in rows
+    ]
+    if not insight_rows:
+        return 0
+    with connect(paths) as conn:
+        conn.executemany(
+            """
+            INSERT INTO live_insights
+              (strategy_version_id, action, symbol, reason_code, score, payload_json, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            insight_rows,
+        )
+        conn.commit()
+    return len(insight_rows)
+
+
 def list_live_insights(paths: RuntimePaths, strategy_version_id: str | None = None, limit: int = 100) -> list[dict[str, Any]]:
     if limit <= 0:
         raise ValueError("limit must be positive")
@@ -1183,13 +1350,17 @@ def list_job_events_after(paths: RuntimePaths, last_id: int) -> list[dict[str, A
     ]
 
 
-def append_audit_event(paths: RuntimePaths, event_type: str, payload: dict[str, Any]) -> None:
+def _audit_event_row(event_type: str, payload: dict[str, Any]) -> tuple[str, str, str]:
     merged_payload = redact_payload(dict(payload))
     merged_payload.setdefault("trace_id", get_trace_id())
+    return (event_type, json.dumps(merged_payload), _utc_now())
+
+
+def append_audit_event(paths: RuntimePaths, event_type: str, payload: dict[str, Any]) -> None:
     with connect(paths) as conn:
         conn.execute(
             "INSERT INTO audit_events (event_type, payload_json, created_at) VALUES (?, ?, ?)",
-            (event_type, json.dumps(merged_payload), _utc_now()),
+            _audit_event_row(event_type, payload),
         )
         conn.commit()
 
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import csv
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -25,8 +26,10 @@ class IndiaTaxAssumptions:
     capital_allocation_mode: str = "equal_max_positions"
 
 
-def _parse_day(value: str) -> datetime:
-    return datetime.strptime(value, "%Y-%m-%d")
+@lru_cache(maxsize=4096)
+def _parse_day(value: str) -> date:
+    # Blotter rows repeat the same handful of entry/exit days; parse each once.
+    return date.fromisoformat(value)
 
 
 def _holding_days(entry_ts: str, exit_ts: str) -> int:
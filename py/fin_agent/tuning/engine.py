@@ -1,13 +1,19 @@
 from __future__ import annotations
 
-from collections.abc import Callable
-from dataclasses import dataclass
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
 from itertools import product
+import heapq
+from operator import itemgetter
 import random
 from typing import Any
 
 from fin_agent.code_strategy.backtest import run_code_strategy_backtest
 from fin_agent.storage.paths import RuntimePaths
+from fin_agent.world_state.service import build_world_state_manifest
 
 
 def _metric_direction(metric_name: str) -> float:
@@ -27,6 +33,7 @@ class _ParameterSpec:
     max_value: float | int | None
     values: tuple[Any, ...]
     step: float | None
+    less_than: str | None = None
 
 
 @dataclass(frozen=True)
@@ -34,6 +41,12 @@ class _Objective:
     metric: str
     maximize: bool
     weights: dict[str, float]
+    signed_weights: tuple[tuple[str, float], ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Direction depends only on the metric name, so resolve it once per run instead of per trial.
+        signed = tuple((metric, weight * _metric_direction(metric)) for metric, weight in self.weights.items())
+        object.__setattr__(self, "signed_weights", signed)
 
 
 def _parse_objective(payload: dict[str, Any] | None) -> _Objective:
@@ -90,7 +103,7 @@ def _normalize_choice_values(name: str, raw: Any) -> _ParameterSpec:
         raise ValueError(f"{name}: choice parameters must be an array")
     if not raw:
         raise ValueError(f"{name}: choice list must not be empty")
-    normalized = tuple(raw)
+    normalized = tuple(dict.fromkeys(raw))
     return _ParameterSpec(
         name=name,
         kind="choice",
@@ -119,6 +132,14 @@ def _normalize_range(name: str, cfg: dict[str, Any], expected_kind: str) -> _Par
         if step_f <= 0:
             raise ValueError(f"{name}.step must be positive")
 
+    less_than = cfg.get("less_than")
+    if less_than is not None:
+        less_than = str(less_than).strip()
+        if not less_than:
+            raise ValueError(f"{name}.less_than must name another parameter")
+        if less_than == name:
+            raise ValueError(f"{name}.less_than must not reference itself")
+
     if expected_kind == "int_range":
         if min_f != int(min_f) or max_f != int(max_f):
             raise ValueError(f"{name}: int_range min and max must be integer values")
@@ -129,6 +150,7 @@ def _normalize_range(name: str, cfg: dict[str, Any], expected_kind: str) -> _Par
             max_value=int(max_f),
             values=(),
             step=step_f,
+            less_than=less_than,
         )
 
     return _ParameterSpec(
@@ -138,6 +160,7 @@ def _normalize_range(name: str, cfg: dict[str, Any], expected_kind: str) -> _Par
         max_value=max_f,
         values=(),
         step=step_f,
+        less_than=less_than,
     )
 
 
@@ -180,6 +203,13 @@ def parse_search_space(raw_search_space: dict[str, Any]) -> list[_ParameterSpec]
 
         specs.append(_normalize_choice_values(param_name, raw))
 
+    kinds = {spec.name: spec.kind for spec in specs}
+    for spec in specs:
+        if spec.less_than is None:
+            continue
+        if kinds.get(spec.less_than) not in {"int_range", "float_range"}:
+            raise ValueError(f"{spec.name}.less_than must reference a range parameter: {spec.less_than}")
+
     return specs
 
 
@@ -199,13 +229,30 @@ def _coerce_param_for_grid(spec: _ParameterSpec, value: float) -> Any:
     raise ValueError(f"unexpected spec kind: {spec.kind}")
 
 
+@lru_cache(maxsize=256)
+def _stepped_range_values(spec: _ParameterSpec) -> tuple[Any, ...]:
+    # Stepped ranges ignore layer and anchors, so every layer would rebuild the same values.
+    min_value = _coerce_float(spec.min_value, label=f"{spec.name}.min")
+    max_value = _coerce_float(spec.max_value, label=f"{spec.name}.max")
+    step = float(spec.step or 0.0)
+    values: list[Any] = []
+    current = min_value
+    while current <= max_value + (1e-12):
+        values.append(_coerce_param_for_grid(spec, current))
+        current += step
+
+    if values[-1] != _coerce_param_for_grid(spec, max_value):
+        values.append(_coerce_param_for_grid(spec, max_value))
+    return tuple(dict.fromkeys(values))
+
+
 def _candidate_values_from_anchor(
     spec: _ParameterSpec,
     layer: int,
     anchors: list[dict[str, Any]] | None,
 ) -> list[Any]:
     if spec.kind == "choice":
-        return list(dict.fromkeys(spec.values))
+        return list(spec.values)
 
     if spec.kind not in {"int_range", "float_range"}:
         raise ValueError(f"{spec.name}: unsupported range kind: {spec.kind}")
@@ -216,28 +263,23 @@ def _candidate_values_from_anchor(
     if span < 0:
         raise ValueError(f"{spec.name}: max must be >= min")
 
-    if step := spec.step:
-        values: list[Any] = []
-        current = min_value
-        while current <= max_value + (1e-12):
-            values.append(_coerce_param_for_grid(spec, current))
-            current += step
-
-        if values[-1] != _coerce_param_for_grid(spec, max_value):
-            values.append(_coerce_param_for_grid(spec, max_value))
-        dedupe = list(dict.fromkeys(values))
-        return dedupe
+    if spec.step:
+        return list(_stepped_range_values(spec))
 
     if span == 0:
         return [_coerce_param_for_grid(spec, min_value)]
 
     if not anchors:
-        # broad initial probes (min / mid / max)
-        return [
-            _coerce_param_for_grid(spec, min_value),
-            _coerce_param_for_grid(spec, min_value + span / 2.0),
-            _coerce_param_for_grid(spec, max_value),
-        ]
+        # broad initial probes (min / mid / max); narrow int ranges can round two probes together
+        return list(
+            dict.fromkeys(
+                (
+                    _coerce_param_for_grid(spec, min_value),
+                    _coerce_param_for_grid(spec, min_value + span / 2.0),
+                    _coerce_param_for_grid(spec, max_value),
+                )
+            )
+        )
 
     radius = span / float(2 ** (layer + 1))
     values: set[float] = set()
@@ -253,28 +295,78 @@ def _candidate_values_from_anchor(
             values.add(float(candidate))
 
     if not values:
-        return [
-            _coerce_param_for_grid(spec, min_value),
-            _coerce_param_for_grid(spec, min_value + span / 2.0),
-            _coerce_param_for_grid(spec, max_value),
-        ]
-
-    return sorted(_coerce_param_for_grid(spec, value) for value in values)
+        return _candidate_values_from_anchor(spec, layer=layer, anchors=None)
 
+    return sorted({_coerce_param_for_grid(spec, value) for value in values})
 
-def _generate_param_grid(specs: list[_ParameterSpec], layer: int, anchors: list[dict[str, Any]] | None) -> list[dict[str, Any]]:
-    param_values: list[tuple[Any, ...]] = []
 
-    for spec in specs:
-        values = tuple(_candidate_values_from_anchor(spec, layer=layer, anchors=anchors))
+def _generate_param_grid(
+    specs: list[_ParameterSpec],
+    layer: int,
+    anchors: list[dict[str, Any]] | None,
+    axis_values: list[list[Any]] | None = None,
+) -> list[tuple[Any, ...]]:
+    """Return grid rows as value tuples ordered like ``specs``.
+
+    Range values arrive coerced and deduped from ``_candidate_values_from_anchor``,
+    so only choice axes are coerced here, once per axis rather than once per grid
+    cell; callers build dicts only for selected rows.
+    Rows violating a ``less_than`` constraint are dropped here, before sampling, so
+    they never take a slot from ``max_trials_per_layer``. ``axis_values`` lets
+    callers pass per-spec values they already derived for this layer.
+    """
+    axes: list[tuple[Any, ...]] = []
+    for index, spec in enumerate(specs):
+        if axis_values is not None:
+            values = axis_values[index]
+        else:
+            values = _candidate_values_from_anchor(spec, layer=layer, anchors=anchors)
         if not values:
             raise ValueError(f"failed to generate values for parameter '{spec.name}'")
-        param_values.append(values)
-
-    grid = []
-    for row in product(*param_values):
-        grid.append({specs[index].name: _coerce_param_for_grid(specs[index], float(value)) for index, value in enumerate(row)})
-    return grid
+        if spec.kind == "choice":
+            values = dict.fromkeys(_coerce_param_for_grid(spec, float(value)) for value in values)
+        axes.append(tuple(values))
+
+    positions = {spec.name: index for index, spec in enumerate(specs)}
+    ordered_pairs = [
+        (index, positions[spec.less_than]) for index, spec in enumerate(specs) if spec.less_than is not None
+    ]
+    rows: Iterator[tuple[Any, ...]]
+    if ordered_pairs:
+        # Filter only the prefix of axes the constraints touch, then expand the
+        # unconstrained suffix per surviving prefix; row order matches product(*axes).
+        depth = max(max(pair) for pair in ordered_pairs) + 1
+        prefixes = [
+            prefix
+            for prefix in product(*axes[:depth])
+            if all(prefix[low] < prefix[high] for low, high in ordered_pairs)
+        ]
+        suffix_axes = axes[depth:]
+        rows = (prefix + suffix for prefix in prefixes for suffix in product(*suffix_axes))
+    else:
+        rows = product(*axes)
+    return list(rows)
+
+
+def _stratified_order(rows: list[tuple[Any, ...]], rng: random.Random) -> list[tuple[Any, ...]]:
+    """Shuffle ``rows`` so the leading rows cover every value of every axis.
+
+    Rows are shuffled with ``rng``; the first row carrying an unseen axis value is
+    moved to the front, so any budget at least as large as the covering prefix
+    samples each value once before the rest is drawn uniformly.
+    """
+    rng.shuffle(rows)
+    seen: set[tuple[int, Any]] = set()
+    covering: list[tuple[Any, ...]] = []
+    rest: list[tuple[Any, ...]] = []
+    for row in rows:
+        cells = [(index, value) for index, value in enumerate(row) if (index, value) not in seen]
+        if cells:
+            seen.update(cells)
+            covering.append(row)
+        else:
+            rest.append(row)
+    return covering + rest
 
 
 def _score_candidate(metrics: dict[str, Any], objective: _Objective) -> tuple[float, str]:
@@ -291,13 +383,12 @@ def _score_candidate(metrics: dict[str, Any], objective: _Objective) -> tuple[fl
 
     score = 0.0
     used_metrics: list[str] = []
-    for metric, weight in objective.weights.items():
+    for metric, signed_weight in objective.signed_weights:
         if metric not in metrics:
             continue
         value = _coerce_float(metrics[metric], label=f"metrics[{metric}]")
-        direction = _metric_direction(metric)
         used_metrics.append(metric)
-        score += weight * direction * value
+        score += signed_weight * value
 
     if not used_metrics:
         raise ValueError("objective cannot be computed; no candidate metrics available")
@@ -313,9 +404,8 @@ def _run_candidate(
     run_code_fn: Callable[..., dict[str, Any]],
     context_seed: int | None,
 ) -> dict[str, Any]:
-    if context_seed is not None:
-        random.seed(context_seed)
-
+    # Trials may run on worker threads, so the seed travels in the trial context
+    # rather than reseeding the process-wide ``random`` module.
     run = run_code_fn(
         paths=paths,
         strategy_name=request_payload["strategy_name"],
@@ -346,6 +436,43 @@ def _run_candidate(
     }
 
 
+def _evaluate_layer(
+    evaluate: Callable[[dict[str, Any], int], dict[str, Any]],
+    selected: list[dict[str, Any]],
+    seeds: list[int],
+    n_jobs: int,
+) -> Iterator[tuple[int, dict[str, Any], dict[str, Any] | None, Exception | None]]:
+    """Yield ``(index, params, result, error)`` per candidate in selection order.
+
+    Each trial spends its time in the sandbox subprocess, so worker threads are
+    enough to overlap trials; results are still consumed in order so events,
+    seeds and the evaluated list stay deterministic. Each task runs in a copy of
+    the caller's context so the request trace id follows it into the worker.
+    """
+    if n_jobs <= 1 or len(selected) <= 1:
+        for index, (params, seed) in enumerate(zip(selected, seeds)):
+            try:
+                result = evaluate(params, seed)
+            except Exception as exc:
+                yield index, params, None, exc
+                continue
+            yield index, params, result, None
+        return
+
+    with ThreadPoolExecutor(max_workers=min(n_jobs, len(selected)), thread_name_prefix="fin-agent-tuning") as executor:
+        futures = [
+            executor.submit(contextvars.copy_context().run, evaluate, params, seed)
+            for params, seed in zip(selected, seeds)
+        ]
+        for index, (params, future) in enumerate(zip(selected, futures)):
+            try:
+                result = future.result()
+            except Exception as exc:
+                yield index, params, None, exc
+                continue
+            yield index, params, result, None
+
+
 def tune_strategy(
     *,
     paths: RuntimePaths,
@@ -370,6 +497,7 @@ def tune_strategy(
     run_code_fn: Callable[..., dict[str, Any]] | None = None,
     event_callback: Callable[[dict[str, Any]], None] | None = None,
     only_plan: bool = False,
+    n_jobs: int = 1,
 ) -> dict[str, Any]:
     if not strategy_name.strip():
         raise ValueError("strategy_name is required")
@@ -391,11 +519,11 @@ def tune_strategy(
         raise ValueError("cpu_seconds must be positive")
     if max_trials_per_layer is not None and max_trials_per_layer <= 0:
         raise ValueError("max_trials_per_layer must be positive")
+    if n_jobs <= 0:
+        raise ValueError("n_jobs must be positive")
 
     parsed_objective = _parse_objective(objective)
     specs = parse_search_space(search_space)
-    if run_code_fn is None:
-        run_code_fn = run_code_strategy_backtest
 
     base_context = dict(context or {})
     request_payload = {
@@ -411,9 +539,10 @@ def tune_strategy(
         "context": base_context,
     }
 
+    # Layer 0 has no anchors, so the plan preview and the first grid share these values.
+    initial_axis_values = [_candidate_values_from_anchor(spec=spec, layer=0, anchors=None) for spec in specs]
     candidate_plan: list[dict[str, Any]] = []
-    for spec in specs:
-        values = _candidate_values_from_anchor(spec=spec, layer=0, anchors=None)
+    for spec, values in zip(specs, initial_axis_values):
         candidate_plan.append(
             {
                 "parameter": spec.name,
@@ -422,6 +551,8 @@ def tune_strategy(
                 "sample_values": values[:12],
             }
         )
+        if spec.less_than is not None:
+            candidate_plan[-1]["less_than"] = spec.less_than
 
     if event_callback is not None:
         event_callback(
@@ -453,10 +584,16 @@ def tune_strategy(
     if use_optuna:
         raise ValueError("optuna execution is currently disabled in this build; set use_optuna=false")
 
+    if run_code_fn is None:
+        # Every trial backtests the same universe/date range, so hash the world state once per run.
+        world_manifest = build_world_state_manifest(paths, universe, start_date, end_date)
+        run_code_fn = partial(run_code_strategy_backtest, world_manifest=world_manifest)
+
     layer_decisions: list[dict[str, Any]] = []
     evaluated: list[dict[str, Any]] = []
     best_candidate: dict[str, Any] | None = None
-    evaluated_param_sets: set[tuple[tuple[str, Any], ...]] = set()
+    param_names = [spec.name for spec in specs]
+    evaluated_param_sets: set[tuple[Any, ...]] = set()
     anchors: list[dict[str, Any]] = []
     remaining_trials = int(max_trials)
     rng = random.Random(random_seed)
@@ -465,22 +602,20 @@ def tune_strategy(
         if remaining_trials <= 0:
             break
 
-        candidates = _generate_param_grid(specs, layer=layer, anchors=anchors if anchors else None)
-        if not candidates:
+        rows = _generate_param_grid(
+            specs,
+            layer=layer,
+            anchors=anchors if anchors else None,
+            axis_values=None if anchors else initial_axis_values,
+        )
+        if not rows:
             break
-        if max_trials_per_layer is not None:
-            candidates = candidates[:max_trials_per_layer]
-
-        rng.shuffle(candidates)
-        selected: list[dict[str, Any]] = []
-        for candidate in candidates:
-            key = tuple(sorted(candidate.items(), key=lambda item: item[0]))
-            if key in evaluated_param_sets:
-                continue
-            evaluated_param_sets.add(key)
-            selected.append(candidate)
-            if len(selected) >= remaining_trials:
-                break
+
+        rows = _stratified_order([row for row in rows if row not in evaluated_param_sets], rng)
+        budget = remaining_trials if max_trials_per_layer is None else min(remaining_trials, max_trials_per_layer)
+        sampling_strategy = "exhaustive" if len(rows) <= budget else "stratified"
+        selected = [dict(zip(param_names, row)) for row in rows[:budget]]
+        evaluated_param_sets.update(rows[:budget])
 
         if not selected:
             break
@@ -495,18 +630,20 @@ def tune_strategy(
                 }
             )
 
+        def _evaluate(params: dict[str, Any], seed: int) -> dict[str, Any]:
+            return _run_candidate(
+                paths=paths,
+                request_payload=request_payload,
+                params=params,
+                objective=parsed_objective,
+                run_code_fn=run_code_fn,
+                context_seed=seed,
+            )
+
+        seeds = [rng.randint(-(2**31), 2**31 - 1) for _ in selected]
         layer_results: list[dict[str, Any]] = []
-        for index, params in enumerate(selected):
-            try:
-                candidate_result = _run_candidate(
-                    paths=paths,
-                    request_payload=request_payload,
-                    params=params,
-                    objective=parsed_objective,
-                    run_code_fn=run_code_fn,
-                    context_seed=rng.randint(-(2**31), 2**31 - 1),
-                )
-            except Exception as exc:
+        for index, params, candidate_result, error in _evaluate_layer(_evaluate, selected, seeds, n_jobs):
+            if candidate_result is None:
                 if event_callback is not None:
                     event_callback(
                         {
@@ -514,7 +651,7 @@ def tune_strategy(
                             "layer": layer,
                             "candidate_index": index,
                             "params": params,
-                            "error": str(exc),
+                            "error": str(error),
                         }
                     )
                 continue
@@ -547,8 +684,7 @@ def tune_strategy(
         if not layer_results:
             break
 
-        layer_results.sort(key=lambda row: row["score"], reverse=True)
-        top = layer_results[:keep_top]
+        top = heapq.nlargest(keep_top, layer_results, key=itemgetter("score"))
         anchors = [row["params"] for row in top]
         layer_decisions.append(
             {
@@ -557,6 +693,7 @@ def tune_strategy(
                 "reason": f"evaluated {len(selected)} candidates, retained top {len(top)}",
                 "candidate_count": len(selected),
                 "layer_kept": len(top),
+                "sampling_strategy": sampling_strategy,
             }
         )
 
@@ -4,9 +4,7 @@ import hashlib
 import uuid
 from dataclasses import dataclass
 
-import duckdb
-
-from fin_agent.storage import sqlite_store
+from fin_agent.storage import duckdb_store, sqlite_store
 from fin_agent.storage.paths import RuntimePaths
 
 
@@ -69,7 +67,8 @@ def build_world_state_manifest(
         SELECT symbol, timestamp, published_at, open, high, low, close, volume, dataset_hash
         FROM market_ohlcv
         WHERE symbol IN ({placeholders})
-          AND CAST(timestamp AS DATE) BETWEEN CAST(? AS DATE) AND CAST(? AS DATE)
+          AND timestamp >= CAST(CAST(? AS DATE) AS TIMESTAMP)
+          AND timestamp < CAST(CAST(? AS DATE) AS TIMESTAMP) + INTERVAL 1 DAY
         ORDER BY symbol, timestamp
     """
 
@@ -83,7 +82,8 @@ def build_world_state_manifest(
         SELECT COUNT(*) AS c
         FROM corporate_actions
         WHERE symbol IN ({placeholders})
-          AND CAST(effective_at AS DATE) BETWEEN CAST(? AS DATE) AND CAST(? AS DATE)
+          AND effective_at >= CAST(CAST(? AS DATE) AS TIMESTAMP)
+          AND effective_at < CAST(CAST(? AS DATE) AS TIMESTAMP) + INTERVAL 1 DAY
     """
     ratings_sql = f"""
         SELECT COUNT(*) AS c
@@ -92,7 +92,7 @@ def build_world_state_manifest(
           AND revised_at <= CAST(? AS TIMESTAMP)
     """
 
-    with duckdb.connect(str(runtime_paths.duckdb_path)) as conn:
+    with duckdb_store.shared_cursor(runtime_paths) as conn:
         rows = conn.execute(sql, [*universe, start_date, end_date]).fetchall()
         fundamentals_count = int(conn.execute(fundamentals_sql, [*universe, f"{end_date}T23:59:59"]).fetchone()[0])
         actions_count = int(conn.execute(actions_sql, [*universe, start_date, end_date]).fetchone()[0])
@@ -147,18 +147,20 @@ def build_data_completeness_report(
         SELECT symbol, COUNT(*) AS c
         FROM market_ohlcv
         WHERE symbol IN ({placeholders})
-          AND CAST(timestamp AS DATE) BETWEEN CAST(? AS DATE) AND CAST(? AS DATE)
+          AND timestamp >= CAST(CAST(? AS DATE) AS TIMESTAMP)
+          AND timestamp < CAST(CAST(? AS DATE) AS TIMESTAMP) + INTERVAL 1 DAY
         GROUP BY symbol
     """
     technical_sql = f"""
         SELECT symbol, COUNT(*) AS c
         FROM market_technicals
         WHERE symbol IN ({placeholders})
-          AND CAST(timestamp AS DATE) BETWEEN CAST(? AS DATE) AND CAST(? AS DATE)
+          AND timestamp >= CAST(CAST(? AS DATE) AS TIMESTAMP)
+          AND timestamp < CAST(CAST(? AS DATE) AS TIMESTAMP) + INTERVAL 1 DAY
         GROUP BY symbol
     """
 
-    with duckdb.connect(str(runtime_paths.duckdb_path)) as conn:
+    with duckdb_store.shared_cursor(runtime_paths) as conn:
         ohlcv_rows = conn.execute(ohlcv_sql, [*universe, start_date, end_date]).fetchall()
         technical_rows = conn.execute(technical_sql, [*universe, start_date, end_date]).fetchall()
 
@@ -226,9 +228,10 @@ def validate_world_state_pit(
         SELECT symbol, timestamp, published_at
         FROM market_ohlcv
         WHERE symbol IN ({placeholders})
-          AND CAST(timestamp AS DATE) BETWEEN CAST(? AS DATE) AND CAST(? AS DATE)
+          AND timestamp >= CAST(CAST(? AS DATE) AS TIMESTAMP)
+          AND timestamp < CAST(CAST(? AS DATE) AS TIMESTAMP) + INTERVAL 1 DAY
     """
-    with duckdb.connect(str(runtime_paths.duckdb_path)) as conn:
+    with duckdb_store.shared_cursor(runtime_paths) as conn:
         rows = conn.execute(sql, [*universe, start_date, end_date]).fetchall()
 
     errors: list[str] = []
@@ -381,6 +381,16 @@ class ApiE2ETests(unittest.TestCase):
                     )
                     self.assertEqual(status, 200)
                     self.assertGreaterEqual(live_feed["count"], 1)
+
+                    feed_url = f"{base}/v1/live/feed?strategy_version_id={strategy_version_id}&limit=10"
+                    with urllib.request.urlopen(feed_url, timeout=30) as r:
+                        etag = r.headers["etag"]
+                    self.assertTrue(etag)
+                    conditional = urllib.request.Request(feed_url, headers={"If-None-Match": etag})
+                    with self.assertRaises(urllib.error.HTTPError) as not_modified:
+                        urllib.request.urlopen(conditional, timeout=30)
+                    self.assertEqual(not_modified.exception.code, 304)
+                    self.assertEqual(not_modified.exception.read(), b"")
     
                     status, boundary = _http_json(
                         "GET",
@@ -7,6 +7,7 @@ from pathlib import Path
 from fin_agent.backtest.compare import compare_backtest_runs
 from fin_agent.code_strategy.backtest import run_code_strategy_backtest
 from fin_agent.data.importer import import_ohlcv_file
+from fin_agent.storage import sqlite_store
 from fin_agent.storage.paths import RuntimePaths
 
 
@@ -85,14 +86,51 @@ class BacktestCompareTests(unittest.TestCase):
 
             report = compare_backtest_runs(paths, baseline_run_id=run_a["run_id"], candidate_run_id=run_b["run_id"])
 
-            self.assertEqual(report["baseline"]["run_id"], run_a["run_id"])
-            self.assertEqual(report["candidate"]["run_id"], run_b["run_id"])
-            self.assertIn("metrics_delta", report)
-            self.assertIn("total_return", report["metrics_delta"])
-            self.assertIn("artifact_links", report)
-            self.assertIn("baseline", report["artifact_links"])
-            self.assertIn("candidate", report["artifact_links"])
-            self.assertGreaterEqual(len(report["likely_causes"]), 1)
+            self.assertEqual(report.baseline.run_id, run_a["run_id"])
+            self.assertEqual(report.candidate.run_id, run_b["run_id"])
+            self.assertIn("total_return", report.metrics_delta)
+            self.assertIn("baseline", report.artifact_links)
+            self.assertIn("candidate", report.artifact_links)
+            self.assertGreaterEqual(len(report.likely_causes), 1)
+
+            payload = report.to_dict()
+            self.assertEqual(payload["baseline"]["run_id"], run_a["run_id"])
+            self.assertEqual(payload["candidate"]["run_id"], run_b["run_id"])
+            self.assertIn("total_return", payload["metrics_delta"])
+            self.assertIn("baseline", payload["artifact_links"])
+            self.assertIn("candidate", payload["artifact_links"])
+            self.assertGreaterEqual(len(payload["likely_causes"]), 1)
+
+            with self.assertRaisesRegex(ValueError, "backtest_run not found: missing-run"):
+                compare_backtest_runs(paths, baseline_run_id=run_a["run_id"], candidate_run_id="missing-run")
+
+    def test_compare_reads_strategy_parameters_without_signal_payload(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = RuntimePaths(root=Path(tmp_dir))
+            sqlite_store.init_db(paths)
+            metrics = {"total_return": 0.1, "max_drawdown": -0.05, "sharpe": 1.0, "trade_count": 2}
+            run_ids = [
+                sqlite_store.save_backtest_run(
+                    paths,
+                    strategy_version_id="sv-1",
+                    world_manifest_id="wm-1",
+                    metrics=metrics,
+                    artifacts={"equity_curve_path": f"/tmp/equity-{short_window}.svg"},
+                    payload={
+                        "strategy": {"short_window": short_window, "long_window": 20},
+                        "signals": [{"symbol": "ABC", "signal": "buy"}] * 50,
+                    },
+                )
+                for short_window in (5, 8)
+            ]
+
+            summaries = sqlite_store.get_backtest_run_summaries(paths, [run_ids[1], run_ids[0]])
+            self.assertEqual([item["run_id"] for item in summaries], [run_ids[1], run_ids[0]])
+            self.assertEqual(summaries[0]["strategy"], {"short_window": 8, "long_window": 20})
+            self.assertNotIn("payload", summaries[0])
+
+            report = compare_backtest_runs(paths, baseline_run_id=run_ids[0], candidate_run_id=run_ids[1])
+            self.assertIn("strategy parameter changed: short_window baseline=5 candidate=8", report.likely_causes)
 
 
 if __name__ == "__main__":
@@ -3,7 +3,9 @@ from __future__ import annotations
 import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
+from fin_agent.code_strategy import validator
 from fin_agent.code_strategy.runner import run_code_strategy_sandbox
 from fin_agent.code_strategy.validator import validate_code_strategy_source
 from fin_agent.storage import sqlite_store
@@ -45,6 +47,18 @@ def risk_rules(positions, context):
             validate_code_strategy_source(bad)
         self.assertIn("prepare", str(exc.exception))
 
+    def test_validator_reuses_passing_result_only(self) -> None:
+        source = VALID_CODE + "\n# cache probe\n"
+        with patch.object(validator, "_check_code_strategy_contract", wraps=validator._check_code_strategy_contract) as check:
+            first = validate_code_strategy_source(source)
+            first["valid"] = False
+            second = validate_code_strategy_source(source)
+            for _ in range(2):
+                with self.assertRaises(ValueError):
+                    validate_code_strategy_source("def prepare(data_bundle, context):\n    return {}\n")
+        self.assertEqual(check.call_count, 3)
+        self.assertEqual(second, {"valid": True, "required_functions": ["generate_signals", "prepare", "risk_rules"]})
+
     def test_code_strategy_versioning_increments(self) -> None:
         with tempfile.TemporaryDirectory() as tmp_dir:
             paths = RuntimePaths(root=Path(tmp_dir))
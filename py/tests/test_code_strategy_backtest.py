@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import csv
 import tempfile
 import unittest
 from pathlib import Path
 
+from fin_agent.backtest.metrics import compute_backtest_metrics
 from fin_agent.code_strategy.backtest import run_code_strategy_backtest
 from fin_agent.data.importer import import_ohlcv_file
 from fin_agent.storage.paths import RuntimePaths
@@ -24,6 +26,18 @@ def risk_rules(positions, context):
 """
 
 
+WATCH_CODE = """
+def prepare(data_bundle, context):
+    return {}
+
+def generate_signals(frame, state, context):
+    return []
+
+def risk_rules(positions, context):
+    return {"max_positions": 1}
+"""
+
+
 class CodeStrategyBacktestTests(unittest.TestCase):
     def test_code_strategy_backtest_returns_metrics_and_artifacts(self) -> None:
         with tempfile.TemporaryDirectory() as tmp_dir:
@@ -66,6 +80,93 @@ class CodeStrategyBacktestTests(unittest.TestCase):
             self.assertTrue(Path(run["artifacts"]["equity_curve_path"]).exists())
             self.assertTrue(Path(run["artifacts"]["drawdown_path"]).exists())
 
+            idle = run_code_strategy_backtest(
+                paths=paths,
+                strategy_name="Code Idle",
+                source_code=WATCH_CODE,
+                universe=["ABC"],
+                start_date="2025-01-01",
+                end_date="2025-01-10",
+                initial_capital=100000.0,
+            )
+            self.assertEqual(
+                idle["metrics"],
+                compute_backtest_metrics([100000.0] * 10, trade_count=0).__dict__,
+            )
+
+    def test_signal_context_uses_first_signal_per_symbol(self) -> None:
+        source = """
+def prepare(data_bundle, context):
+    return {}
+
+def generate_signals(frame, state, context):
+    return [
+        {"symbol": "XYZ", "signal": "watch", "reason_code": "xyz_first"},
+        {"symbol": "ABC", "signal": "buy", "strength": 0.5, "reason_code": "abc_first"},
+        {"symbol": "ABC", "signal": "sell", "reason_code": "abc_second"},
+    ]
+
+def risk_rules(positions, context):
+    return {"max_positions": 2}
+"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            csv_path = root / "prices.csv"
+            csv_path.write_text(
+                "\n".join(
+                    [
+                        "timestamp,symbol,open,high,low,close,volume",
+                        "2025-01-01T00:00:00Z,ABC,100,101,99,100,1000",
+                        "2025-01-02T00:00:00Z,ABC,100,102,99,101,1100",
+                        "2025-01-01T00:00:00Z,XYZ,50,51,49,50,1000",
+                        "2025-01-02T00:00:00Z,XYZ,50,52,49,51,1100",
+                    ]
+                ),
+                encoding="utf-8",
+            )
+            paths = RuntimePaths(root=root)
+            import_ohlcv_file(csv_path, paths)
+            run = run_code_strategy_backtest(
+                paths=paths,
+                strategy_name="First Signal",
+                source_code=source,
+                universe=["ABC", "XYZ"],
+                start_date="2025-01-01",
+                end_date="2025-01-02",
+                initial_capital=100000.0,
+            )
+
+            with Path(run["artifacts"]["signal_context_path"]).open(encoding="utf-8", newline="") as handle:
+                rows = list(csv.DictReader(handle))
+            reasons = {(row["symbol"], row["signal"], row["reason_code"]) for row in rows}
+            self.assertEqual(reasons, {("ABC", "buy", "abc_first"), ("XYZ", "watch", "xyz_first")})
+            self.assertEqual(len(rows), 4)
+
+
+    def test_single_date_window_is_rejected_with_or_without_signals(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            csv_path = root / "prices.csv"
+            csv_path.write_text(
+                "timestamp,symbol,open,high,low,close,volume\n2025-01-01T00:00:00Z,ABC,100,101,99,100,1000\n",
+                encoding="utf-8",
+            )
+            paths = RuntimePaths(root=root)
+            import_ohlcv_file(csv_path, paths)
+            messages = []
+            for source_code in (VALID_CODE, WATCH_CODE):
+                with self.assertRaises(ValueError) as exc:
+                    run_code_strategy_backtest(
+                        paths=paths,
+                        strategy_name="Code Single Day",
+                        source_code=source_code,
+                        universe=["ABC"],
+                        start_date="2025-01-01",
+                        end_date="2025-01-01",
+                        initial_capital=100000.0,
+                    )
+                messages.append(str(exc.exception))
+            self.assertEqual(messages[0], messages[1])
 
 if __name__ == "__main__":
     unittest.main()
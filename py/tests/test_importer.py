@@ -1,6 +1,10 @@
+import subprocess
+import sys
 import tempfile
+import time
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 
 class ImporterTests(unittest.TestCase):
@@ -41,6 +45,61 @@ class ImporterTests(unittest.TestCase):
             self.assertEqual(result.rows_inserted, 2)
             self.assertEqual(query_ohlcv_count(paths, "ABC"), 2)
 
+    def test_import_releases_duckdb_lock_for_other_processes(self) -> None:
+        from fin_agent.data.importer import import_ohlcv_file
+        from fin_agent.storage.paths import RuntimePaths
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            csv_path = root / "ok.csv"
+            csv_path.write_text(
+                "timestamp,symbol,open,high,low,close,volume\n2025-01-01T00:00:00Z,ABC,100,102,99,101,1000\n",
+                encoding="utf-8",
+            )
+            paths = RuntimePaths(root=root)
+            import_ohlcv_file(csv_path, paths)
+
+            script = (
+                "import duckdb, sys\n"
+                "with duckdb.connect(sys.argv[1]) as conn:\n"
+                "    print(conn.execute('SELECT COUNT(*) FROM market_ohlcv').fetchone()[0])\n"
+            )
+            proc = subprocess.run(
+                [sys.executable, "-c", script, str(paths.duckdb_path)],
+                capture_output=True,
+                text=True,
+                check=False,
+            )
+            self.assertEqual(proc.returncode, 0, msg=proc.stderr)
+            self.assertEqual(proc.stdout.strip(), "1")
+
+
+    def test_shared_connection_stays_warm_until_idle_timeout(self) -> None:
+        from fin_agent.data.importer import import_ohlcv_file
+        from fin_agent.storage import duckdb_store
+        from fin_agent.storage.paths import RuntimePaths
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            csv_path = root / "ok.csv"
+            csv_path.write_text(
+                "timestamp,symbol,open,high,low,close,volume\n2025-01-01T00:00:00Z,ABC,100,102,99,101,1000\n",
+                encoding="utf-8",
+            )
+            paths = RuntimePaths(root=root)
+            import_ohlcv_file(csv_path, paths)
+            key = str(paths.duckdb_path)
+            self.assertNotIn(key, duckdb_store._SHARED_CONNECTIONS)
+
+            with patch.object(duckdb_store, "_SHARED_IDLE_SECONDS", 0.05):
+                self.assertEqual(duckdb_store.query_ohlcv_count(paths, "ABC"), 1)
+                warm = duckdb_store._SHARED_CONNECTIONS[key].conn
+                self.assertEqual(duckdb_store.query_ohlcv_count(paths, "ABC"), 1)
+                self.assertIs(duckdb_store._SHARED_CONNECTIONS[key].conn, warm)
+                deadline = time.monotonic() + 2.0
+                while key in duckdb_store._SHARED_CONNECTIONS and time.monotonic() < deadline:
+                    time.sleep(0.01)
+            self.assertNotIn(key, duckdb_store._SHARED_CONNECTIONS)
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import tempfile
 import unittest
+from contextlib import contextmanager
 from pathlib import Path
 from unittest.mock import patch
 
+import duckdb
 from fastapi import HTTPException
 
 from fin_agent.api import app as app_module
@@ -69,6 +73,88 @@ class KiteMarketApiTests(unittest.TestCase):
                         )
                     )
         self.assertEqual(out["persisted_rows"], 1)
+        with duckdb.connect(str(paths.duckdb_path)) as conn:
+            stored = conn.execute(
+                "SELECT symbol, CAST(timestamp AS VARCHAR), open, close, volume, source_file FROM market_ohlcv"
+            ).fetchall()
+            summary = conn.execute("SELECT symbol, row_count FROM market_ohlcv_summary").fetchall()
+        self.assertEqual(stored, [("INFY", "2026-02-20 09:15:00", 100.0, 100.5, 10000.0, "kite_api")])
+        self.assertEqual(summary, [("INFY", 1)])
+
+    def test_staged_rows_bind_temp_path_with_quote(self) -> None:
+        paths = self._temp_paths()
+        quoted_tmp = paths.root / "it's"
+        quoted_tmp.mkdir()
+        with patch.object(tempfile, "tempdir", str(quoted_tmp)):
+            with duckdb_store.staged_rows({"symbol": "VARCHAR", "close": "DOUBLE"}, [["INFY", 1.5]]) as (staged, path):
+                self.assertNotIn(path, staged)
+                with duckdb.connect(str(paths.duckdb_path)) as conn:
+                    rows = conn.execute(f"SELECT symbol, close FROM {staged}", [path]).fetchall()
+        self.assertEqual(rows, [("INFY", 1.5)])
+
+    def test_summary_refresh_for_different_symbols_does_not_conflict(self) -> None:
+        paths = self._temp_paths()
+        insert = (
+            "INSERT INTO market_ohlcv (timestamp, published_at, symbol, open, high, low, close, volume, "
+            "source_file, dataset_hash, ingested_at) VALUES "
+            "(TIMESTAMP '2026-02-20 09:15:00', TIMESTAMP '2026-02-20 09:15:00', ?, 1, 1, 1, 1, 1, 'kite_api', 'h', now())"
+        )
+        with duckdb.connect(str(paths.duckdb_path)) as conn:
+            first = conn.cursor()
+            second = conn.cursor()
+            first.begin()
+            second.begin()
+            first.execute(insert, ["INFY"])
+            second.execute(insert, ["TCS"])
+            duckdb_store.refresh_ohlcv_summary(first, ["INFY"])
+            duckdb_store.refresh_ohlcv_summary(second, ["TCS"])
+            first.commit()
+            second.commit()
+            summary = conn.execute("SELECT symbol, row_count FROM market_ohlcv_summary ORDER BY symbol").fetchall()
+        self.assertEqual(summary, [("INFY", 1), ("TCS", 1)])
+
+    def test_kite_candles_fetch_write_conflict_returns_http_409(self) -> None:
+        paths = self._temp_paths()
+        candles = [
+            {
+                "timestamp": "2026-02-20T09:15:00+0530",
+                "open": 100.0,
+                "high": 101.0,
+                "low": 99.0,
+                "close": 100.5,
+                "volume": 10000.0,
+                "oi": None,
+            }
+        ]
+        refresh = duckdb_store.refresh_ohlcv_summary
+
+        def conflicting_refresh(conn, symbols=None):
+            if symbols is None:
+                return refresh(conn)
+            raise duckdb.TransactionException("Conflict on tuple deletion!")
+
+        with patch.object(app_module, "_runtime_paths", return_value=paths):
+            with patch.dict("os.environ", self._env(), clear=False):
+                with patch("fin_agent.api.app.kite_integration.fetch_historical_candles", return_value=candles):
+                    with patch(
+                        "fin_agent.api.app.duckdb_store.refresh_ohlcv_summary",
+                        side_effect=conflicting_refresh,
+                    ):
+                        with self.assertRaises(HTTPException) as exc:
+                            app_module.kite_candles_fetch(
+                                app_module.KiteCandlesFetchRequest(
+                                    symbol="INFY",
+                                    instrument_token="123",
+                                    interval="5minute",
+                                    from_ts="2026-02-20 09:15:00",
+                                    to_ts="2026-02-20 15:30:00",
+                                    persist=True,
+                                )
+                            )
+        self.assertEqual(exc.exception.status_code, 409)
+        self.assertEqual(exc.exception.detail["code"], "market_write_conflict")
+        with duckdb.connect(str(paths.duckdb_path)) as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM market_ohlcv").fetchone()[0], 0)
 
     def test_kite_candles_fetch_cache_hit_skips_upstream(self) -> None:
         paths = self._temp_paths()
@@ -116,6 +202,92 @@ class KiteMarketApiTests(unittest.TestCase):
         self.assertTrue(second["cache_hit"])
         self.assertEqual(second["rows"], 1)
 
+        request = app_module.KiteCandlesFetchRequest(
+            symbol="INFY",
+            instrument_token="123",
+            interval="5minute",
+            from_ts="2026-02-20 09:15:00",
+            to_ts="2026-02-20 15:30:00",
+            persist=True,
+            use_cache=True,
+        )
+        with patch.object(app_module, "_runtime_paths", return_value=paths):
+            with patch(
+                "fin_agent.api.app.sqlite_store.get_kite_candle_cache",
+                side_effect=AssertionError("warm cache hit should not query SQLite"),
+            ):
+                third = app_module.kite_candles_fetch(request)
+            self.assertEqual(third["dataset_hash"], first["dataset_hash"])
+
+            refreshed_candles = [dict(candles[0], close=102.0)]
+            with patch.dict("os.environ", self._env(), clear=False):
+                with patch("fin_agent.api.app.kite_integration.fetch_historical_candles", return_value=refreshed_candles):
+                    refreshed = app_module.kite_candles_fetch(request.model_copy(update={"force_refresh": True}))
+            after_refresh = app_module.kite_candles_fetch(request)
+        self.assertFalse(refreshed["cache_hit"])
+        self.assertNotEqual(refreshed["dataset_hash"], first["dataset_hash"])
+        self.assertEqual(after_refresh["dataset_hash"], refreshed["dataset_hash"])
+
+    def test_kite_instruments_sync_replaces_previous_rows(self) -> None:
+        paths = self._temp_paths()
+        instruments = [
+            {"instrument_token": 101, "exchange": "NSE", "tradingsymbol": "INFY", "lot_size": 1, "tick_size": 0.05},
+            {"instrument_token": 102, "exchange": "NSE", "tradingsymbol": "TCS", "strike": None},
+            {"instrument_token": 103, "exchange": "NSE", "tradingsymbol": "WIPRO", "expiry": ""},
+        ]
+        with patch.object(app_module, "_runtime_paths", return_value=paths):
+            with patch.dict("os.environ", self._env(), clear=False):
+                with patch("fin_agent.api.app.kite_integration.fetch_instruments", return_value=instruments):
+                    app_module.kite_instruments_sync(app_module.KiteInstrumentsSyncRequest(exchange="NSE"))
+                with patch("fin_agent.api.app.kite_integration.fetch_instruments", return_value=instruments[:2]):
+                    out = app_module.kite_instruments_sync(app_module.KiteInstrumentsSyncRequest(exchange="NSE"))
+
+        self.assertEqual(out["rows"], 2)
+        with duckdb.connect(str(paths.duckdb_path)) as conn:
+            rows = conn.execute(
+                "SELECT instrument_token, tradingsymbol, lot_size, strike FROM market_instruments ORDER BY instrument_token"
+            ).fetchall()
+        self.assertEqual(rows, [("101", "INFY", 1.0, None), ("102", "TCS", None, None)])
+
+    def test_dataset_hash_matches_whole_document_digest(self) -> None:
+        rows = [{"instrument_token": str(index), "tradingsymbol": f"SYM{index}", "lot_size": 1} for index in range(1300)]
+        for payload in (rows, rows[:512], rows[:513], [], {"rows": rows[:3]}):
+            expected = hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+            self.assertEqual(app_module._json_hash(payload), expected)
+
+    def test_kite_instruments_and_quotes_store_errors_roll_back(self) -> None:
+        paths = self._temp_paths()
+
+        @contextmanager
+        def failing_stage(columns, rows):
+            names = ", ".join(f"NULL AS {name}" for name in columns)
+            yield f"(SELECT {names}, ? AS staged_path WHERE error('staging failed') IS NULL)", "unused"
+
+        instruments = [{"instrument_token": 101, "exchange": "NSE", "tradingsymbol": "INFY"}]
+        quotes = {"NSE:INFY": {"instrument_token": 123, "last_price": 1700.5}}
+        with patch.object(app_module, "_runtime_paths", return_value=paths):
+            with patch.dict("os.environ", self._env(), clear=False):
+                with patch("fin_agent.api.app.kite_integration.fetch_instruments", return_value=instruments):
+                    with patch("fin_agent.api.app.duckdb_store.staged_rows", failing_stage):
+                        with self.assertRaises(HTTPException) as instruments_exc:
+                            app_module.kite_instruments_sync(app_module.KiteInstrumentsSyncRequest(exchange="NSE"))
+                    synced = app_module.kite_instruments_sync(app_module.KiteInstrumentsSyncRequest(exchange="NSE"))
+                with patch("fin_agent.api.app.kite_integration.fetch_ltp", return_value=quotes):
+                    with patch("fin_agent.api.app.duckdb_store.staged_rows", failing_stage):
+                        with self.assertRaises(HTTPException) as quotes_exc:
+                            app_module.kite_quotes_fetch(
+                                app_module.KiteQuotesFetchRequest(instruments=["NSE:INFY"], persist=True)
+                            )
+                    fetched = app_module.kite_quotes_fetch(
+                        app_module.KiteQuotesFetchRequest(instruments=["NSE:INFY"], persist=True)
+                    )
+
+        for exc in (instruments_exc, quotes_exc):
+            self.assertEqual(exc.exception.status_code, 500)
+            self.assertEqual(exc.exception.detail["code"], "market_store_error")
+        self.assertEqual(synced["rows"], 1)
+        self.assertEqual(fetched["persisted"], 1)
+
     def test_kite_quotes_fetch_returns_payload(self) -> None:
         paths = self._temp_paths()
         with patch.object(app_module, "_runtime_paths", return_value=paths):
@@ -130,6 +302,31 @@ class KiteMarketApiTests(unittest.TestCase):
         self.assertEqual(out["received"], 1)
         self.assertIn("NSE:INFY", out["quotes"])
 
+    def test_kite_quotes_fetch_persists_rows(self) -> None:
+        paths = self._temp_paths()
+        quotes = {
+            "NSE:INFY": {"instrument_token": 123, "last_price": 1700.5},
+            "NSE:TCS": {"instrument_token": 456, "last_price": None},
+        }
+        with patch.object(app_module, "_runtime_paths", return_value=paths):
+            with patch.dict("os.environ", self._env(), clear=False):
+                with patch("fin_agent.api.app.kite_integration.fetch_ltp", return_value=quotes):
+                    out = app_module.kite_quotes_fetch(
+                        app_module.KiteQuotesFetchRequest(instruments=["NSE:INFY", "NSE:TCS"], persist=True)
+                    )
+        self.assertEqual(out["persisted"], 2)
+        with duckdb.connect(str(paths.duckdb_path)) as conn:
+            rows = conn.execute(
+                "SELECT quote_key, instrument_token, last_price, payload_json, source FROM market_quotes ORDER BY quote_key"
+            ).fetchall()
+        self.assertEqual(
+            rows,
+            [
+                ("NSE:INFY", "123", 1700.5, '{"instrument_token": 123, "last_price": 1700.5}', "kite"),
+                ("NSE:TCS", "456", None, '{"instrument_token": 456, "last_price": null}', "kite"),
+            ],
+        )
+
     def test_kite_rate_limited_returns_http_429(self) -> None:
         paths = self._temp_paths()
         rate_limit_integration.reset_rate_limits()
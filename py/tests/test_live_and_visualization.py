@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import csv
 import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import patch
 
+from fastapi import HTTPException
+
 from fin_agent.api import app as app_module
+from fin_agent.live import service as live_service
+from fin_agent.storage import sqlite_store
 from fin_agent.storage.paths import RuntimePaths
 
 
@@ -72,6 +77,62 @@ class LiveAndVisualizationTests(unittest.TestCase):
         self.assertTrue(Path(report["artifacts"]["trade_blotter_path"]).exists())
         self.assertTrue(Path(report["artifacts"]["signal_context_path"]).exists())
 
+    def test_trade_blotter_counts_threshold_crossings(self) -> None:
+        with patch.object(app_module, "_runtime_paths", return_value=self.paths):
+            report = app_module.visualize_trade_blotter(app_module.TradeBlotterRequest(run_id=self.run_id))
+        signal_path = Path(report["artifacts"]["signal_context_path"])
+        signal_path.write_text(
+            "symbol,timestamp,close,signal,strength,reason_code\n"
+            "ABC,2025-01-01,100,buy,0.5,signal_buy\n"
+            "ABC,2025-01-02,101,hold,0.1,flat\n"
+            "\n"
+            "ABC,2025-01-03,102,sell,0.4,sma_cross_down\n",
+            encoding="utf-8",
+        )
+        with patch.object(app_module, "_runtime_paths", return_value=self.paths):
+            report = app_module.visualize_trade_blotter(app_module.TradeBlotterRequest(run_id=self.run_id))
+        self.assertEqual(report["signal_rows"], 3)
+        self.assertEqual(report["threshold_crossings"], 2)
+        self.assertEqual(report["trade_count"], len(report["trades"]))
+        if report["trades"]:
+            self.assertIsInstance(report["trades"][0], dict)
+
+    def test_trade_blotter_rows_keep_dict_reader_semantics_for_ragged_rows(self) -> None:
+        with patch.object(app_module, "_runtime_paths", return_value=self.paths):
+            report = app_module.visualize_trade_blotter(app_module.TradeBlotterRequest(run_id=self.run_id))
+        trade_path = Path(report["artifacts"]["trade_blotter_path"])
+        trade_path.write_text("symbol,side,qty\nABC,buy,1\nABC\nABC,sell,1,extra\n", encoding="utf-8")
+        with trade_path.open("r", encoding="utf-8", newline="") as handle:
+            expected = [dict(row) for row in csv.DictReader(handle)]
+        self.assertEqual(app_module._read_csv_rows(str(trade_path)), expected)
+        self.assertEqual(expected[1], {"symbol": "ABC", "side": None, "qty": None})
+        self.assertEqual(expected[2][None], ["extra"])
+
+    def test_trade_blotter_counts_quoted_multiline_reason_codes(self) -> None:
+        with patch.object(app_module, "_runtime_paths", return_value=self.paths):
+            report = app_module.visualize_trade_blotter(app_module.TradeBlotterRequest(run_id=self.run_id))
+        signal_path = Path(report["artifacts"]["signal_context_path"])
+        signal_path.write_text(
+            "symbol,timestamp,close,signal,strength,reason_code\n"
+            'ABC,2025-01-01,100,buy,0.5,"signal_buy\nbreakout"\n'
+            "ABC,2025-01-02,101,hold,0.1,flat\n",
+            encoding="utf-8",
+        )
+        with patch.object(app_module, "_runtime_paths", return_value=self.paths):
+            report = app_module.visualize_trade_blotter(app_module.TradeBlotterRequest(run_id=self.run_id))
+        self.assertEqual(report["signal_rows"], 2)
+        self.assertEqual(report["threshold_crossings"], 1)
+
+    def test_trade_blotter_unparseable_signal_context_returns_http_400(self) -> None:
+        with patch.object(app_module, "_runtime_paths", return_value=self.paths):
+            report = app_module.visualize_trade_blotter(app_module.TradeBlotterRequest(run_id=self.run_id))
+        signal_path = Path(report["artifacts"]["signal_context_path"])
+        signal_path.write_text('symbol,reason_code\nABC,"signal_buy\n', encoding="utf-8")
+        with patch.object(app_module, "_runtime_paths", return_value=self.paths):
+            with self.assertRaises(HTTPException) as exc:
+                app_module.visualize_trade_blotter(app_module.TradeBlotterRequest(run_id=self.run_id))
+        self.assertEqual(exc.exception.status_code, 400)
+
     def test_live_lifecycle_and_boundary_candidates(self) -> None:
         with patch.object(app_module, "_runtime_paths", return_value=self.paths):
             activated = app_module.live_activate(
@@ -89,6 +150,54 @@ class LiveAndVisualizationTests(unittest.TestCase):
         self.assertEqual(paused["status"], "paused")
         self.assertEqual(stopped["status"], "stopped")
 
+    def test_live_activate_persists_snapshot_insights(self) -> None:
+        with patch.object(app_module, "_runtime_paths", return_value=self.paths):
+            activated = app_module.live_activate(
+                app_module.LiveActivateRequest(strategy_version_id=self.strategy_version_id)
+            )
+        insights = sqlite_store.list_live_insights(self.paths, strategy_version_id=self.strategy_version_id)
+        self.assertEqual(len(insights), activated["insight_count"])
+        self.assertEqual(insights[0]["symbol"], "ABC")
+        self.assertEqual(insights[0]["reason_code"], "signal_buy_live")
+        self.assertEqual(insights[0]["payload"]["action"], "buy")
+
+    def test_live_pause_and_stop_stamp_state_payload(self) -> None:
+        with patch.object(app_module, "_runtime_paths", return_value=self.paths):
+            app_module.live_activate(app_module.LiveActivateRequest(strategy_version_id=self.strategy_version_id))
+            app_module.live_pause(app_module.LiveLifecycleRequest(strategy_version_id=self.strategy_version_id))
+            paused = sqlite_store.get_live_state(self.paths, self.strategy_version_id)
+            app_module.live_stop(app_module.LiveLifecycleRequest(strategy_version_id=self.strategy_version_id))
+            stopped = sqlite_store.get_live_state(self.paths, self.strategy_version_id)
+            with self.assertRaises(app_module.HTTPException) as ctx:
+                app_module.live_pause(app_module.LiveLifecycleRequest(strategy_version_id="missing"))
+
+        self.assertEqual(paused["status"], "paused")
+        self.assertIn("paused_at", paused["payload"])
+        self.assertEqual(paused["payload"]["universe_size"], 1)
+        self.assertEqual(stopped["status"], "stopped")
+        self.assertEqual(stopped["payload"]["paused_at"], paused["payload"]["paused_at"])
+        self.assertIn("stopped_at", stopped["payload"])
+        self.assertEqual(ctx.exception.status_code, 400)
+        self.assertIn("live_state not found", str(ctx.exception.detail))
+
+    def test_boundary_polling_reuses_sandbox_signals(self) -> None:
+        live_service.clear_signal_cache()
+        with (
+            patch.object(app_module, "_runtime_paths", return_value=self.paths),
+            patch.object(
+                live_service, "run_code_strategy_sandbox", wraps=live_service.run_code_strategy_sandbox
+            ) as sandbox,
+        ):
+            first = app_module.live_boundary_candidates(strategy_version_id=self.strategy_version_id, top_k=5)
+            first["candidates"][0]["signal_payload"]["reason_code"] = "mutated"
+            second = app_module.live_boundary_candidates(strategy_version_id=self.strategy_version_id, top_k=5)
+            chart = app_module.visualize_boundary(
+                app_module.BoundaryVisualizationRequest(strategy_version_id=self.strategy_version_id, top_k=5)
+            )
+        self.assertEqual(sandbox.call_count, 1)
+        self.assertEqual(second["candidates"][0]["signal_payload"]["reason_code"], "signal_buy_live")
+        self.assertEqual(chart["candidates"], second["candidates"])
+
     def test_boundary_visualization_artifact(self) -> None:
         with patch.object(app_module, "_runtime_paths", return_value=self.paths):
             payload = app_module.visualize_boundary(
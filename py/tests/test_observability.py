@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import contextlib
 import json
 import tempfile
+import time
 import unittest
 from pathlib import Path
 from unittest.mock import patch
@@ -35,6 +37,7 @@ class ObservabilityTests(unittest.TestCase):
                     app_module._write_structured_log("request.start", {"path": "/health"})
                 finally:
                     reset_trace_id(token)
+                app_module._flush_structured_log()
             log_path = paths.logs_dir / "structured.log"
             self.assertTrue(log_path.exists())
             rows = log_path.read_text(encoding="utf-8").strip().splitlines()
@@ -42,6 +45,93 @@ class ObservabilityTests(unittest.TestCase):
             obj = json.loads(rows[0])
             self.assertEqual(obj["event_type"], "request.start")
             self.assertEqual(obj["trace_id"], "trace-log-xyz")
+            self.assertEqual(rows[0], json.dumps(obj, sort_keys=True))
+            self.assertIn('"trace_id": "trace-log-xyz"', rows[0])
+
+    def test_structured_log_rows_are_flushed_in_background(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = RuntimePaths(root=Path(tmp_dir))
+            log_path = paths.logs_dir / "structured.log"
+            with patch.object(app_module, "_runtime_paths", return_value=paths):
+                for index in range(3):
+                    app_module._write_structured_log("request.end", {"path": "/health", "index": index})
+            for _ in range(100):
+                if log_path.exists() and len(log_path.read_text(encoding="utf-8").splitlines()) == 3:
+                    break
+                time.sleep(0.01)
+            rows = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+            self.assertEqual([row["index"] for row in rows], [0, 1, 2])
+            self.assertEqual(app_module._read_structured_log_stats(paths)["request_count"], 3)
+
+    def test_structured_log_flush_creates_missing_runtime_root(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = RuntimePaths(root=Path(tmp_dir) / "missing-home")
+            with patch.object(app_module, "_runtime_paths", return_value=paths):
+                app_module._write_structured_log("request.start", {"path": "/health"})
+                app_module._flush_structured_log()
+            rows = (paths.logs_dir / "structured.log").read_text(encoding="utf-8").splitlines()
+            self.assertEqual(json.loads(rows[0])["event_type"], "request.start")
+
+    def test_structured_log_rows_are_requeued_when_write_fails(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = RuntimePaths(root=Path(tmp_dir))
+            with patch.object(app_module, "_runtime_paths", return_value=paths):
+                with patch.object(app_module, "_start_structured_log_flusher"):
+                    app_module._write_structured_log("request.start", {"path": "/health"})
+                with patch.object(Path, "open", side_effect=RuntimeError("disk gone")):
+                    # The background flusher may take the rows first; either way the write fails.
+                    with contextlib.suppress(RuntimeError):
+                        app_module._flush_structured_log()
+                app_module._flush_structured_log()
+            rows = (paths.logs_dir / "structured.log").read_text(encoding="utf-8").splitlines()
+            self.assertEqual([json.loads(row)["event_type"] for row in rows], ["request.start"])
+
+    def test_oversized_structured_log_row_is_replaced_by_summary(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = RuntimePaths(root=Path(tmp_dir))
+            with patch.object(app_module, "_runtime_paths", return_value=paths):
+                app_module._write_structured_log(
+                    "request.error",
+                    {"method": "POST", "path": "/v1/backtests/run", "error": "x" * 20000},
+                )
+                app_module._flush_structured_log()
+            line = (paths.logs_dir / "structured.log").read_text(encoding="utf-8")
+            row = json.loads(line)
+            self.assertLess(len(line), 1024)
+            self.assertTrue(row["truncated"])
+            self.assertGreater(row["payload_size"], 20000)
+            self.assertEqual(len(row["payload_sha256_16"]), 16)
+            self.assertEqual((row["event_type"], row["path"]), ("request.error", "/v1/backtests/run"))
+            self.assertNotIn("error", row)
+
+    def test_structured_log_stats_parse_only_appended_rows(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = RuntimePaths(root=Path(tmp_dir))
+            paths.ensure()
+            log_path = paths.logs_dir / "structured.log"
+            rows = [
+                {"event_type": "request.end", "duration_ms": 2.0},
+                {"event_type": "request.error"},
+                {"event_type": "request.end", "duration_ms": 4.0},
+            ]
+            log_path.write_text("".join(json.dumps(row) + "\n" for row in rows[:2]), encoding="utf-8")
+            first = app_module._read_structured_log_stats(paths)
+            self.assertEqual(first, {"request_count": 1, "error_count": 1, "avg_request_duration_ms": 2.0})
+
+            with log_path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(rows[2]) + "\n" + '{"event_type": "request.e')
+            second = app_module._read_structured_log_stats(paths)
+            self.assertEqual(second, {"request_count": 2, "error_count": 1, "avg_request_duration_ms": 3.0})
+
+            with log_path.open("a", encoding="utf-8") as handle:
+                handle.write('nd", "duration_ms": 6.0}\n')
+            third = app_module._read_structured_log_stats(paths)
+            self.assertEqual(third["request_count"], 3)
+            self.assertEqual(third["avg_request_duration_ms"], 4.0)
+
+            log_path.write_text(json.dumps(rows[0]) + "\n", encoding="utf-8")
+            reset = app_module._read_structured_log_stats(paths)
+            self.assertEqual(reset, {"request_count": 1, "error_count": 0, "avg_request_duration_ms": 2.0})
 
     def test_audit_events_endpoint_returns_filtered_rows(self) -> None:
         with tempfile.TemporaryDirectory() as tmp_dir:
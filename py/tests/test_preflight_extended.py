@@ -5,6 +5,7 @@ import unittest
 from pathlib import Path
 
 from fin_agent.analysis.preflight import (
+    _count_market_rows,
     enforce_custom_code_budget,
     enforce_tuning_budget,
     enforce_world_state_budget,
@@ -73,6 +74,56 @@ class PreflightExtendedTests(unittest.TestCase):
         )
         self.assertGreater(result["estimated_seconds"], 0)
 
+    def test_estimated_row_count_tracks_precise_count(self) -> None:
+        paths = self._seed()
+        estimated = _count_market_rows(paths, ["ABC"], "2025-01-01", "2025-01-05")
+        precise = _count_market_rows(paths, ["ABC"], "2025-01-01", "2025-01-05", precise=True)
+        self.assertEqual(estimated, precise)
+        self.assertGreaterEqual(_count_market_rows(paths, ["ABC"], "2025-01-05", "2025-01-09"), 1)
+        with self.assertRaises(ValueError) as exc:
+            _count_market_rows(paths, ["ABC"], "2026-01-01", "2026-01-31")
+        self.assertIn("no rows available", str(exc.exception))
+
+    def test_estimated_row_count_rejects_range_inside_data_gap(self) -> None:
+        paths = self._seed()
+        later_path = paths.root / "later.csv"
+        later_path.write_text(
+            "timestamp,symbol,open,high,low,close,volume\n2025-01-20T00:00:00Z,ABC,105,107,104,106,1300\n",
+            encoding="utf-8",
+        )
+        import_ohlcv_file(later_path, paths)
+        with self.assertRaises(ValueError) as exc:
+            _count_market_rows(paths, ["ABC"], "2025-01-08", "2025-01-12")
+        self.assertIn("no rows available", str(exc.exception))
+        self.assertGreaterEqual(_count_market_rows(paths, ["ABC"], "2025-01-05", "2025-01-12"), 1)
+
+    def test_row_count_cache_is_invalidated_by_import(self) -> None:
+        paths = self._seed()
+        first = _count_market_rows(paths, ["ABC"], "2025-01-01", "2025-01-10", precise=True)
+        self.assertEqual(first, _count_market_rows(paths, ["ABC"], "2025-01-01", "2025-01-10", precise=True))
+        extra_path = paths.root / "extra.csv"
+        extra_path.write_text(
+            "timestamp,symbol,open,high,low,close,volume\n2025-01-06T00:00:00Z,ABC,105,107,104,106,1300\n",
+            encoding="utf-8",
+        )
+        import_ohlcv_file(extra_path, paths)
+        self.assertEqual(_count_market_rows(paths, ["ABC"], "2025-01-01", "2025-01-10", precise=True), first + 1)
+
+    def test_preflight_coefficients_override_from_runtime_home(self) -> None:
+        paths = self._seed()
+        baseline = enforce_world_state_budget(paths, ["ABC"], "2025-01-01", "2025-01-05", max_estimated_seconds=10.0)
+        self.assertAlmostEqual(baseline["estimated_seconds"], 5 * 0.0001 + 0.01)
+        (paths.root / "preflight.json").write_text(
+            '{"world_state_per_row": 0.001, "world_state_per_symbol": 0.02}',
+            encoding="utf-8",
+        )
+        tuned = enforce_world_state_budget(paths, ["ABC"], "2025-01-01", "2025-01-05", max_estimated_seconds=10.0)
+        self.assertAlmostEqual(tuned["estimated_seconds"], 5 * 0.001 + 0.02)
+
+        (paths.root / "preflight.json").write_text('{"world_state_per_row": -1}', encoding="utf-8")
+        with self.assertRaises(ValueError):
+            enforce_world_state_budget(paths, ["ABC"], "2025-01-01", "2025-01-05", max_estimated_seconds=10.0)
+
 
 if __name__ == "__main__":
     unittest.main()
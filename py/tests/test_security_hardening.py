@@ -23,6 +23,13 @@ class SecurityHardeningTests(unittest.TestCase):
         self.assertIn("...", redacted["access_token"])
         self.assertNotEqual(redacted["nested"]["api_secret"], "secret-value")
 
+    def test_redaction_matches_key_substrings_inside_lists_and_copies_containers(self) -> None:
+        payload = {"rows": [{"Kite_Access_Token": "abcdefghijkl", "count": 2}], 7: None, "flag": True}
+        redacted = redact_payload(payload)
+        self.assertEqual(redacted, {"rows": [{"Kite_Access_Token": "abcd...ijkl", "count": 2}], "7": None, "flag": True})
+        self.assertIsNot(redacted["rows"], payload["rows"])
+        self.assertEqual(payload["rows"][0]["Kite_Access_Token"], "abcdefghijkl")
+
     def test_observability_and_provider_health_endpoints(self) -> None:
         with tempfile.TemporaryDirectory() as tmp_dir:
             paths = RuntimePaths(root=Path(tmp_dir) / ".finagent")
@@ -49,6 +49,22 @@ class SessionRehydrateTests(unittest.TestCase):
                 self.assertIn("a", changed_paths)
                 self.assertIn("nested.y", changed_paths)
 
+    def test_flatten_state_diff_orders_changes_by_path(self) -> None:
+        changes: list[dict] = []
+        app_module._flatten_state_diff(
+            "",
+            {"b": {"y": 1, "z": [1]}, "c": 1, "d": {"same": {"deep": 1}}},
+            {"a": 0, "b": {"y": 2, "w": None}, "d": {"same": {"deep": 1}}},
+            changes,
+        )
+        self.assertEqual(
+            [(item["path"], item["change_type"]) for item in changes],
+            [("a", "added"), ("b.w", "added"), ("b.y", "changed"), ("b.z", "removed"), ("c", "removed")],
+        )
+        root_changes: list[dict] = []
+        app_module._flatten_state_diff("", [1], [2], root_changes)
+        self.assertEqual(root_changes, [{"path": "$", "change_type": "changed", "before": [1], "after": [2]}])
+
 
 if __name__ == "__main__":
     unittest.main()
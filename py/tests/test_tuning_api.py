@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import sqlite3
 import tempfile
 import time
 import unittest
@@ -7,7 +8,9 @@ from pathlib import Path
 from unittest.mock import patch
 
 from fin_agent.api import app as app_module
+from fin_agent.storage import sqlite_store
 from fin_agent.storage.paths import RuntimePaths
+from fin_agent.tuning.engine import tune_strategy
 
 
 TUNING_CODE = """
@@ -100,6 +103,18 @@ class TuningApiTests(unittest.TestCase):
         self.assertGreaterEqual(list_payload["count"], 1)
         self.assertIn("best_score", list_payload["runs"][0])
 
+    def test_tuning_trials_share_one_world_manifest(self) -> None:
+        request = self._tuning_request().model_copy(update={"max_trials": 2})
+        with patch.object(app_module, "_runtime_paths", return_value=self.paths):
+            payload = app_module.create_tuning_run(request)
+
+        evaluated = payload["result"]["evaluated_candidates"]
+        self.assertEqual(len(evaluated), 2)
+        manifest_ids = {
+            sqlite_store.get_backtest_run(self.paths, row["run_id"])["world_manifest_id"] for row in evaluated
+        }
+        self.assertEqual(len(manifest_ids), 1)
+
     def test_async_tuning_run_updates_job_and_detail(self) -> None:
         with patch.object(app_module, "_runtime_paths", return_value=self.paths):
             payload = app_module.create_tuning_run(self._tuning_request(only_plan=False, run_async=True))
@@ -122,5 +137,38 @@ class TuningApiTests(unittest.TestCase):
             self.assertGreaterEqual(updated_detail["payload"]["result"]["trials_attempted"], 1)
 
 
+    def test_parallel_trials_through_code_backtest_save_distinct_versions(self) -> None:
+        result = tune_strategy(
+            paths=self.paths,
+            strategy_name="Parallel Tuning",
+            source_code=TUNING_CODE,
+            universe=["ABC"],
+            start_date="2025-01-01",
+            end_date="2025-01-05",
+            initial_capital=100000.0,
+            search_space={"max_positions": {"type": "int_range", "min": 1, "max": 6, "step": 1}},
+            max_trials=6,
+            max_layers=1,
+            timeout_seconds=5,
+            memory_mb=128,
+            cpu_seconds=2,
+            random_seed=3,
+            n_jobs=6,
+        )
+
+        self.assertEqual(result["trials_attempted"], 6)
+        self.assertEqual(len(result["evaluated_candidates"]), 6)
+        with sqlite3.connect(self.paths.sqlite_path) as conn:
+            strategies = conn.execute(
+                "SELECT id FROM code_strategies WHERE name = ?", ("Parallel Tuning",)
+            ).fetchall()
+            versions = conn.execute(
+                "SELECT version_number FROM code_strategy_versions WHERE strategy_id = ? ORDER BY version_number",
+                (strategies[0][0],),
+            ).fetchall()
+        self.assertEqual(len(strategies), 1)
+        self.assertEqual([row[0] for row in versions], [1, 2, 3, 4, 5, 6])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import tempfile
+import threading
+import time
+import unittest
+from itertools import product
+from pathlib import Path
+from typing import Any
+
+from fin_agent.observability.context import reset_trace_id, set_trace_id
+from fin_agent.storage import sqlite_store
+from fin_agent.storage.paths import RuntimePaths
+from fin_agent.tuning.engine import _generate_param_grid, parse_search_space, tune_strategy
+
+
+class _FakeBacktest:
+    def __init__(self, delay_seconds: float = 0.0, fail_on: set[int] | None = None) -> None:
+        self.delay_seconds = delay_seconds
+        self.fail_on = fail_on or set()
+        self.calls: list[dict[str, Any]] = []
+        self.thread_names: set[str] = set()
+        self._lock = threading.Lock()
+
+    def __call__(self, **kwargs: Any) -> dict[str, Any]:
+        params = kwargs["context"]["tuning_params"]
+        with self._lock:
+            self.calls.append(dict(params))
+            self.thread_names.add(threading.current_thread().name)
+        if self.delay_seconds:
+            time.sleep(self.delay_seconds)
+        window = int(params["window"])
+        if window in self.fail_on:
+            raise ValueError(f"window {window} failed")
+        return {
+            "run_id": f"run-{window}",
+            "metrics": {"sharpe": float(window), "max_drawdown": -0.1},
+        }
+
+
+class _FakeWindowBacktest:
+    def __init__(self) -> None:
+        self.calls: list[dict[str, Any]] = []
+
+    def __call__(self, **kwargs: Any) -> dict[str, Any]:
+        params = kwargs["context"]["tuning_params"]
+        self.calls.append(dict(params))
+        return {
+            "run_id": f"run-{params['short_window']}-{params['long_window']}",
+            "metrics": {"sharpe": float(params["long_window"] - params["short_window"])},
+        }
+
+
+class TuningEngineTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.paths = RuntimePaths(root=Path(self._tmp.name))
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _tune(self, run_code_fn: _FakeBacktest, **overrides: Any) -> dict[str, Any]:
+        kwargs: dict[str, Any] = {
+            "paths": self.paths,
+            "strategy_name": "Engine",
+            "source_code": "def prepare(data_bundle, context):\n    return {}\n",
+            "universe": ["ABC"],
+            "start_date": "2025-01-01",
+            "end_date": "2025-01-10",
+            "initial_capital": 100000.0,
+            "search_space": {"window": {"type": "int_range", "min": 1, "max": 6, "step": 1}},
+            "max_trials": 6,
+            "max_layers": 1,
+            "random_seed": 7,
+            "run_code_fn": run_code_fn,
+        }
+        kwargs.update(overrides)
+        return tune_strategy(**kwargs)
+
+    def test_parallel_trials_match_serial_results(self) -> None:
+        serial = self._tune(_FakeBacktest())
+        fake = _FakeBacktest(delay_seconds=0.02)
+        events: list[dict[str, Any]] = []
+        parallel = self._tune(fake, n_jobs=3, event_callback=events.append)
+
+        self.assertEqual(parallel["evaluated_candidates"], serial["evaluated_candidates"])
+        self.assertEqual(parallel["best_candidate"]["params"], {"window": 6})
+        self.assertGreater(len(fake.thread_names), 1)
+        indexes = [event["candidate_index"] for event in events if event["event"] == "tuning.candidate.evaluated"]
+        self.assertEqual(indexes, list(range(6)))
+
+    def test_parallel_failures_are_reported_and_skipped(self) -> None:
+        events: list[dict[str, Any]] = []
+        result = self._tune(_FakeBacktest(fail_on={2, 4}), n_jobs=2, event_callback=events.append)
+
+        failed = [event for event in events if event["event"] == "tuning.candidate.failed"]
+        self.assertEqual(sorted(event["params"]["window"] for event in failed), [2, 4])
+        self.assertEqual(result["trials_attempted"], 4)
+
+    def test_parallel_trial_audit_events_keep_request_trace_id(self) -> None:
+        sqlite_store.init_db(self.paths)
+        fake = _FakeBacktest(delay_seconds=0.01)
+
+        def audited(**kwargs: Any) -> dict[str, Any]:
+            sqlite_store.append_audit_event(self.paths, "test.trial", {"params": kwargs["context"]["tuning_params"]})
+            return fake(**kwargs)
+
+        token = set_trace_id("req-123")
+        try:
+            self._tune(audited, n_jobs=3)
+        finally:
+            reset_trace_id(token)
+
+        events = sqlite_store.list_audit_events(self.paths, event_type="test.trial")
+        self.assertEqual(len(events), 6)
+        self.assertGreater(len(fake.thread_names), 1)
+        self.assertEqual({event["payload"]["trace_id"] for event in events}, {"req-123"})
+
+    def test_param_grid_rows_are_coerced_tuples(self) -> None:
+        specs = parse_search_space(
+            {
+                "window": {"type": "int_range", "min": 2, "max": 4, "step": 1},
+                "weight": {"type": "float_range", "min": 0.0, "max": 1.0},
+            }
+        )
+
+        rows = _generate_param_grid(specs, layer=0, anchors=None)
+        self.assertEqual(len(rows), 9)
+        self.assertEqual(rows[0], (2, 0.0))
+        self.assertIsInstance(rows[0][0], int)
+
+    def test_less_than_constraint_drops_rows_before_trial_budget(self) -> None:
+        specs = parse_search_space(
+            {
+                "short_window": {"type": "int_range", "min": 2, "max": 6, "step": 2, "less_than": "long_window"},
+                "long_window": {"type": "int_range", "min": 4, "max": 8, "step": 2},
+            }
+        )
+        rows = _generate_param_grid(specs, layer=0, anchors=None)
+        self.assertEqual(rows, [(2, 4), (2, 6), (2, 8), (4, 6), (4, 8), (6, 8)])
+
+        fake = _FakeWindowBacktest()
+        result = self._tune(
+            fake,
+            search_space={
+                "short_window": {"type": "int_range", "min": 2, "max": 6, "step": 2, "less_than": "long_window"},
+                "long_window": {"type": "int_range", "min": 4, "max": 8, "step": 2},
+            },
+            max_trials=20,
+        )
+        self.assertEqual(result["trials_attempted"], 6)
+        self.assertTrue(all(call["short_window"] < call["long_window"] for call in fake.calls))
+
+    def test_constrained_grid_keeps_product_order(self) -> None:
+        specs = parse_search_space(
+            {
+                "mode": [1, 2],
+                "fast": {"type": "int_range", "min": 1, "max": 5, "step": 1, "less_than": "slow"},
+                "slow": {"type": "int_range", "min": 1, "max": 5, "step": 1},
+                "weight": {"type": "float_range", "min": 0.0, "max": 1.0, "step": 0.5},
+            }
+        )
+        expected = [
+            row
+            for row in product((1, 2), range(1, 6), range(1, 6), (0.0, 0.5, 1.0))
+            if row[1] < row[2]
+        ]
+
+        self.assertEqual(_generate_param_grid(specs, layer=0, anchors=None), expected)
+
+    def test_choice_values_are_deduped_once_at_parse_time(self) -> None:
+        specs = parse_search_space({"mode": {"choices": [3, 1, 3, 2, 1]}})
+        self.assertEqual(specs[0].values, (3, 1, 2))
+        self.assertEqual(_generate_param_grid(specs, layer=1, anchors=[{"mode": 3}]), [(3,), (1,), (2,)])
+
+    def test_rounded_probe_values_do_not_repeat_trials(self) -> None:
+        specs = parse_search_space({"window": {"type": "int_range", "min": 1, "max": 2}})
+        self.assertEqual(_generate_param_grid(specs, layer=0, anchors=None), [(1,), (2,)])
+        self.assertEqual(_generate_param_grid(specs, layer=1, anchors=[{"window": 1}, {"window": 2}]), [(1,), (2,)])
+
+        fake = _FakeBacktest()
+        result = self._tune(fake, search_space={"window": {"type": "int_range", "min": 1, "max": 2}}, max_layers=2)
+        self.assertEqual(sorted(call["window"] for call in fake.calls), [1, 2])
+        self.assertEqual(result["trials_attempted"], 2)
+
+    def test_less_than_must_reference_range_parameter(self) -> None:
+        with self.assertRaisesRegex(ValueError, "short_window.less_than must reference a range parameter: missing"):
+            parse_search_space({"short_window": {"type": "int_range", "min": 1, "max": 3, "less_than": "missing"}})
+        with self.assertRaisesRegex(ValueError, "must not reference itself"):
+            parse_search_space({"short_window": {"type": "int_range", "min": 1, "max": 3, "less_than": "short_window"}})
+
+    def test_capped_layer_samples_every_axis_value(self) -> None:
+        search_space = {
+            "short_window": {"type": "int_range", "min": 1, "max": 6, "step": 1},
+            "long_window": {"type": "int_range", "min": 10, "max": 15, "step": 1},
+        }
+        fake = _FakeWindowBacktest()
+        result = self._tune(fake, search_space=search_space, max_trials=8)
+
+        self.assertEqual(len(fake.calls), 8)
+        self.assertEqual({call["short_window"] for call in fake.calls}, set(range(1, 7)))
+        self.assertEqual({call["long_window"] for call in fake.calls}, set(range(10, 16)))
+        self.assertEqual(result["layer_decisions"][0]["sampling_strategy"], "stratified")
+
+        repeat = _FakeWindowBacktest()
+        self._tune(repeat, search_space=search_space, max_trials=8)
+        self.assertEqual(repeat.calls, fake.calls)
+
+    def test_uncapped_layer_is_exhaustive(self) -> None:
+        result = self._tune(_FakeBacktest())
+        self.assertEqual(result["trials_attempted"], 6)
+        self.assertEqual(result["layer_decisions"][0]["sampling_strategy"], "exhaustive")
+
+    def test_weighted_objective_flips_drawdown_direction(self) -> None:
+        result = self._tune(_FakeBacktest(), objective={"weights": {"sharpe": 1.0, "max_drawdown": 2.0}})
+        best = result["best_candidate"]
+        self.assertEqual(best["params"], {"window": 6})
+        self.assertAlmostEqual(best["score"], 6.2)
+        self.assertEqual(best["score_metric"], "sharpe,max_drawdown")
+
+    def test_rejects_non_positive_n_jobs(self) -> None:
+        with self.assertRaisesRegex(ValueError, "n_jobs must be positive"):
+            self._tune(_FakeBacktest(), n_jobs=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
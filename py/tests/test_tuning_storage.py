@@ -17,6 +17,11 @@ class TuningStorageTests(unittest.TestCase):
     def tearDown(self) -> None:
         self._tmp.cleanup()
 
+    def test_connections_use_wal_with_normal_sync(self) -> None:
+        with sqlite_store.connect(self.paths) as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 1)
+
     def test_save_tuning_run_persists_trials_and_layer_decisions(self) -> None:
         payload = {
             "tuning_run_id": "run-1",
@@ -66,6 +71,8 @@ class TuningStorageTests(unittest.TestCase):
         with self.assertRaises(ValueError) as ctx:
             sqlite_store.save_tuning_run(self.paths, strategy_name="Invalid", payload=payload)
         self.assertIn("missing run_id", str(ctx.exception))
+        with self.assertRaises(ValueError):
+            sqlite_store.get_tuning_run(self.paths, tuning_run_id="run-2")
 
     def test_update_tuning_run_merges_payload(self) -> None:
         run_id = sqlite_store.save_tuning_run(
@@ -88,6 +95,36 @@ class TuningStorageTests(unittest.TestCase):
         self.assertEqual(tuning["payload"]["result"]["status"], "running")
         self.assertEqual(tuning["payload"]["result"]["stage"], "executing")
 
+    def test_update_tuning_run_with_audit_writes_both(self) -> None:
+        run_id = sqlite_store.save_tuning_run(
+            self.paths,
+            strategy_name="Audit Test",
+            payload={"tuning_run_id": "run-4", "status": "running", "result": {"status": "running"}},
+        )
+        sqlite_store.update_tuning_run_with_audit(
+            self.paths,
+            tuning_run_id=run_id,
+            updates={"status": "completed", "result": {"status": "completed"}},
+            event_type="tuning.run.completed",
+            audit_payload={"tuning_run_id": run_id, "api_key": "secret-value"},
+        )
+        tuning = sqlite_store.get_tuning_run(self.paths, tuning_run_id=run_id)
+        self.assertEqual(tuning["payload"]["result"]["status"], "completed")
+        events = sqlite_store.list_audit_events(self.paths, event_type="tuning.run.completed")
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]["payload"]["tuning_run_id"], run_id)
+        self.assertNotEqual(events[0]["payload"]["api_key"], "secret-value")
+
+        with self.assertRaisesRegex(ValueError, "tuning_run not found: missing"):
+            sqlite_store.update_tuning_run_with_audit(
+                self.paths,
+                tuning_run_id="missing",
+                updates={"status": "failed"},
+                event_type="tuning.run.failed",
+                audit_payload={"tuning_run_id": "missing"},
+            )
+        self.assertEqual(sqlite_store.list_audit_events(self.paths, event_type="tuning.run.failed"), [])
+
     def test_append_tuning_trial_and_layer_persistence(self) -> None:
         base_run_id = sqlite_store.save_tuning_run(
             self.paths,
@@ -138,6 +175,16 @@ class TuningStorageTests(unittest.TestCase):
                 score=1.2,
             )
         self.assertIn("backtest_run_id is required", str(ctx.exception))
+        with self.assertRaisesRegex(ValueError, "tuning_run not found: missing"):
+            sqlite_store.append_tuning_trial(
+                self.paths,
+                tuning_run_id="missing",
+                backtest_run_id="bt-1",
+                params={"short_window": 5},
+                metrics={"sharpe": 1.2},
+                score=1.2,
+            )
+        self.assertEqual(sqlite_store.list_tuning_trials(self.paths, "missing"), [])
 
 
 if __name__ == "__main__":
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import asyncio
 import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import patch
 
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
 from fin_agent.api import app as app_module
 from fin_agent.storage.paths import RuntimePaths
 
@@ -132,5 +136,40 @@ class UiHistoryEndpointTests(unittest.TestCase):
         self.assertEqual(ctx_two.exception.status_code, 410)
 
 
+
+class ConditionalGetTests(unittest.TestCase):
+    def _get(self, if_none_match: str | None = None):  # type: ignore[no-untyped-def]
+        headers = [(b"if-none-match", if_none_match.encode("latin-1"))] if if_none_match is not None else []
+        request = Request({"type": "http", "method": "GET", "path": "/v1/code-strategies", "headers": headers, "query_string": b""})
+
+        async def call_next(_request):  # type: ignore[no-untyped-def]
+            response = StreamingResponse(iter([b'{"count":', b"0}"]), media_type="application/json")
+            response.raw_headers.append((b"set-cookie", b"a=1"))
+            response.raw_headers.append((b"set-cookie", b"b=2"))
+            return response
+
+        return asyncio.run(app_module.conditional_get_middleware(request, call_next))
+
+    def test_repeated_headers_survive_200_and_304(self) -> None:
+        first = self._get()
+        etag = first.headers["etag"]
+        self.assertEqual(first.body, b'{"count":0}')
+        self.assertEqual(first.headers.getlist("set-cookie"), ["a=1", "b=2"])
+        self.assertEqual(first.headers.getlist("content-length"), [str(len(first.body))])
+        not_modified = self._get(etag)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.headers.getlist("set-cookie"), ["a=1", "b=2"])
+        self.assertEqual(not_modified.headers["etag"], etag)
+        self.assertNotIn("content-type", not_modified.headers)
+        self.assertNotIn("content-length", not_modified.headers)
+
+    def test_if_none_match_uses_weak_comparison_lists_and_wildcard(self) -> None:
+        etag = self._get().headers["etag"]
+        for header in ("*", f"W/{etag}", f'"other", {etag}', f'"a,b" , W/{etag}'):
+            self.assertEqual(self._get(header).status_code, 304, header)
+        for header in ('"other"', "", f'"x{etag[1:]}'):
+            self.assertEqual(self._get(header).status_code, 200, header)
+
+
 if __name__ == "__main__":
     unittest.main()